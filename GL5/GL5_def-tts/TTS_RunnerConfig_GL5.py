@@ -14,6 +14,7 @@ from ConfigValidator.Config.Models.OperationType import OperationType
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from ConnectionHandler import ConnectionHandler
+from Plugins.Probes.ReadinessProbes import ContainerCount
 
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -177,29 +178,18 @@ class RunnerConfig:
 
         output.console_log("Waiting for Train Ticket System to start up")
 
-        output.console_log(f"Sleep {self.wait_time/60} minutes...")
-
-        time.sleep(self.wait_time)
-
-        num_containers = self.con_SUT.get_containers_count()
-
         # check number of containers to be sure the TTS is properly working
-        if num_containers < 68:
-            output.console_log(f"Sleep for {self.wait_time/60} more minutes...")
-            time.sleep(self.wait_time)
-
+        if not context.wait_until(ContainerCount(self.SUT, 68), timeout_in_s=self.wait_time * 2, interval_in_s=15):
             num_containers = self.con_SUT.get_containers_count()
-
-            if num_containers < 68:
-                error_msg = f"Not enough containers running: {num_containers}/68"
-                # log if not working
-                write_to_log(f"[{context.run_variation['runs']}] [{workload}] Not enough containers. FAILED", self.SUT, True)
-                if not self.testing:
-                    self.discard_run = True
-                    self.con_SUT.execute_remote_command(f"echo {passSUT} | sudo reboot", "REBOOT SUT")
-                time.sleep(self.wait_time*2)                
-                # cleanup if not running
-                self.interrupt_run(context, error_msg)
+            error_msg = f"Not enough containers running: {num_containers}/68"
+            # log if not working
+            write_to_log(f"[{context.run_variation['runs']}] [{workload}] Not enough containers. FAILED", self.SUT, True)
+            if not self.testing:
+                self.discard_run = True
+                self.con_SUT.execute_remote_command(f"echo {passSUT} | sudo reboot", "REBOOT SUT")
+            time.sleep(self.wait_time*2)                
+            # cleanup if not running
+            self.interrupt_run(context, error_msg)
 
         output.console_log("Benchmark system initialized and running")
 
@@ -1,11 +1,13 @@
 import os
 import uuid
 import inspect
+from pathlib import Path
 from typing import List
 from shutil import copyfile
 from tabulate import tabulate
 
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ExperimentOrchestrator.Experiment.RunTableShard import RunTableShard
 from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
@@ -77,6 +79,29 @@ class Prepare:
     def execute(args=None) -> None:
         pass
 
+class Merge:
+    @staticmethod
+    def description_params() -> str:
+        return "<destination_dir> <shard_dir> [<shard_dir> ...]"
+
+    @staticmethod
+    def description_short() -> str:
+        return "Merges the experiment folders of the shards of an experiment (--shard) into one experiment folder"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("Merge combines the run tables, run folders and phase timings of the shards of an experiment, " +
+                                "performed with `--shard i/N`, into a new experiment folder.\n" +
+                                "The shards must have been performed with the same config (md5sum) and define the same columns.\n" +
+                                "example: python experiment-runner/ merge experiments/gl experiments/gl_shard_1of2 experiments/gl_shard_2of2")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        if args is None or len(args) < 4:
+            raise InvalidCommandArgumentsError('merge', Merge.description_params())
+
+        RunTableShard.merge(Path(args[2]).expanduser(), [Path(shard_path).expanduser() for shard_path in args[3:]])
+
 class Help:
     @staticmethod
     def description_params() -> str:
@@ -90,6 +115,11 @@ class Help:
     def description_long() -> str:
         print(BashHeaders.BOLD + "--- EXPERIMENT_RUNNER HELP ---" + BashHeaders.ENDC)
         print("\n%-*s  %s" % (10, "Usage:", "python experiment-runner/ <path_to_config.py>"))
+        print("%-*s  %s" % (10, "Simulate:", "python experiment-runner/ <path_to_config.py> --simulate [--all]"))
+        print("%-*s  %s" % (10, "Extend:", "python experiment-runner/ <path_to_config.py> --extend"))
+        print("%-*s  %s" % (10, "Shard:", "python experiment-runner/ <path_to_config.py> --shard <i/N>"))
+        print("%-*s  %s" % (10, "Coordinate:", "python experiment-runner/ <path_to_config.py> --coordinator <[host:]port>"))
+        print("%-*s  %s" % (10, "Worker:", "python experiment-runner/ <path_to_config.py> --worker <host:port>"))
         print("%-*s  %s" % (10, "Utility:", "python experiment-runner/ <command>"))
 
         print("\nAvailable commands:\n")
@@ -106,6 +136,7 @@ class CLIRegister:
     register = {
         "config-create":    ConfigCreate,
         "prepare":          Prepare,
+        "merge":            Merge,
         "help":             Help
     }
 
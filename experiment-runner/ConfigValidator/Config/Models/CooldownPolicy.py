@@ -0,0 +1,73 @@
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class CooldownPolicy:
+    """Ends the cooldown between two runs as soon as the value returned by `probe` (e.g. CPU utilisation, temperature
+    or power) is stable: the last `window` samples lie within a band of `tolerance` (and, if `baseline` is given,
+    within `tolerance` of the baseline). The cooldown lasts at least `min_cooldown_in_ms` and at most
+    `max_cooldown_in_ms`, which defaults to `RunnerConfig.time_between_runs_in_ms`."""
+
+    def __init__(self,
+                 probe: Callable[[], float],
+                 tolerance: float,
+                 min_cooldown_in_ms: int = 0,
+                 max_cooldown_in_ms: Optional[int] = None,
+                 poll_interval_in_ms: int = 5000,
+                 window: int = 5,
+                 baseline: Optional[float] = None
+                 ):
+        if window < 2:
+            raise BaseError("The window of a cooldown policy must contain at least 2 samples!")
+
+        if max_cooldown_in_ms is not None and max_cooldown_in_ms < min_cooldown_in_ms:
+            raise BaseError("The maximum cooldown of a cooldown policy is smaller than its minimum cooldown!")
+
+        self.probe = probe
+        self.tolerance = tolerance
+        self.min_cooldown_in_ms = min_cooldown_in_ms
+        self.max_cooldown_in_ms = max_cooldown_in_ms
+        self.poll_interval_in_ms = poll_interval_in_ms
+        self.window = window
+        self.baseline = baseline
+
+    def is_stable(self, samples) -> bool:
+        if len(samples) < self.window:
+            return False
+
+        if max(samples) - min(samples) > self.tolerance:
+            return False
+
+        if self.baseline is not None:
+            return all(abs(sample - self.baseline) <= self.tolerance for sample in samples)
+        return True
+
+    def wait(self, default_max_cooldown_in_ms: int) -> int:
+        """Blocks until the system is cooled down and returns the actual cooldown time in ms."""
+        max_cooldown_in_ms = self.max_cooldown_in_ms if self.max_cooldown_in_ms is not None else default_max_cooldown_in_ms
+        if max_cooldown_in_ms <= 0:
+            return 0  # no cooldown between the runs at all (time_between_runs_in_ms = 0), nothing to probe
+        samples = deque(maxlen=self.window)
+
+        start = time.monotonic()
+        while True:
+            try:
+                samples.append(float(self.probe()))
+            except Exception as e:
+                output.console_log_WARNING(f"Cooldown probe failed, discarding samples: {e}")
+                samples.clear()
+
+            elapsed_ms = (time.monotonic() - start) * 1000
+            if elapsed_ms >= max_cooldown_in_ms:
+                output.console_log_WARNING(f"Maximum cooldown of {max_cooldown_in_ms}ms reached")
+                break
+            if elapsed_ms >= self.min_cooldown_in_ms and self.is_stable(samples):
+                break
+
+            time.sleep(min(self.poll_interval_in_ms, max_cooldown_in_ms - elapsed_ms) / 1000)
+
+        return round((time.monotonic() - start) * 1000)
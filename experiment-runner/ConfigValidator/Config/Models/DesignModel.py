@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+
+
+class DesignModel(ABC):
+    """Selects the treatment combinations (cells) of the run table from the full factorial of its factors. The runs
+    keep the id they have in the full factorial, so that a run table of a design can be restarted like any other."""
+
+    @abstractmethod
+    def generate_cells(self, factors: List[FactorModel]) -> List[Tuple[int, ...]]:
+        """The cells of the design, as the index of the treatment of every factor."""
+        pass
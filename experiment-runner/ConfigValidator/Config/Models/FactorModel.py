@@ -1,16 +1,39 @@
-from typing import List
+from typing import List, Optional
 
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ExtendedTyping.Typing import SupportsStr
 
 
 class FactorModel:
-    def __init__(self, factor_name: str, treatments: List[SupportsStr]):
+    DTYPES = [str, int, float, bool]
+
+    def __init__(self, factor_name: str, treatments: List[SupportsStr], dtype: Optional[type] = None):
+        """`dtype` is the type of the treatments as read back from the stored run table (e.g. on restart): one of
+        str, int, float or bool. By default it is inferred from the treatments, other objects are read back as str."""
         if len(set(treatments)) != len(treatments):
             raise BaseError(f"Treatment levels for factor {factor_name} are not unique!")
 
+        if dtype is None:
+            dtype = self.__infer_dtype(treatments)
+        if dtype not in self.DTYPES:
+            raise BaseError(f"Unsupported dtype {dtype} for factor {factor_name}, expected one of: "
+                            f"{', '.join(t.__name__ for t in self.DTYPES)}")
+
         self.__factor_name = factor_name
         self.__treatments = treatments
+        self.__dtype = dtype
+
+    @staticmethod
+    def __infer_dtype(treatments: List[SupportsStr]) -> type:
+        if all(isinstance(treatment, bool) for treatment in treatments):
+            return bool
+        if any(isinstance(treatment, bool) for treatment in treatments):
+            return str
+        if all(isinstance(treatment, int) for treatment in treatments):
+            return int
+        if all(isinstance(treatment, (int, float)) for treatment in treatments):
+            return float
+        return str
 
     @property
     def factor_name(self) -> str:
@@ -19,3 +42,7 @@ class FactorModel:
     @property
     def treatments(self) -> List[SupportsStr]:
         return self.__treatments
+
+    @property
+    def dtype(self) -> type:
+        return self.__dtype
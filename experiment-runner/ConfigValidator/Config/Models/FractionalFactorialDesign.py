@@ -0,0 +1,62 @@
+import itertools
+from typing import List, Optional, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConfigValidator.Config.Models.DesignModel import DesignModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+
+
+class FractionalFactorialDesign(DesignModel):
+    """A 2-level fractional factorial design of (at least) the given `resolution`, for factors with 2 treatments each:
+      - resolution 3: main effects are not aliased with each other, but may be with 2-factor interactions.
+      - resolution 4: main effects are not aliased with 2-factor interactions either.
+      - resolution 5: 2-factor interactions are not aliased with each other.
+    The smallest fraction that is found is used. The first factors form a full factorial, the treatment of every
+    other factor follows from the treatments of these base factors (its generator)."""
+
+    MAX_SEARCH_STEPS = 100000       # Per number of base factors, before trying a larger fraction
+
+    def __init__(self, resolution: int = 3):
+        if resolution < 3:
+            raise BaseError("The resolution of a fractional factorial design must be at least 3!")
+
+        self.resolution = resolution
+
+    def __find_generators(self, base_factors: int, added_factors: int) -> Optional[List[int]]:
+        # A generator is the set of base factors (as a bitmask) whose interaction an added factor is aliased with. Every
+        # product of generators is a word of the defining relation, the resolution is the length of its shortest word.
+        candidates = sorted((mask for mask in range(1, 2 ** base_factors)
+                             if bin(mask).count('1') >= max(2, self.resolution - 1)),
+                            key=lambda mask: bin(mask).count('1'), reverse=True)
+        steps = 0
+
+        def search(generators: List[int], words: List[Tuple[int, int]], first_candidate: int) -> Optional[List[int]]:
+            nonlocal steps
+            if len(generators) == added_factors:
+                return generators
+            for i in range(first_candidate, len(candidates)):
+                steps += 1
+                if steps > self.MAX_SEARCH_STEPS:
+                    return None
+                new_words = [(candidates[i], 1)] + [(mask ^ candidates[i], count + 1) for mask, count in words]
+                if all(bin(mask).count('1') + count >= self.resolution for mask, count in new_words):
+                    found = search(generators + [candidates[i]], words + new_words, i + 1)
+                    if found is not None:
+                        return found
+            return None
+
+        return search([], [], 0)
+
+    def generate_cells(self, factors: List[FactorModel]) -> List[Tuple[int, ...]]:
+        for factor in factors:
+            if len(factor.treatments) != 2:
+                raise BaseError(f"Factor {factor.factor_name} of a fractional factorial design does not have 2 treatments!")
+
+        for base_factors in range(1, len(factors) + 1):
+            generators = self.__find_generators(base_factors, len(factors) - base_factors)
+            if generators is not None:
+                break
+
+        return [base + tuple(bin(generator & sum(digit << i for i, digit in enumerate(base))).count('1') % 2
+                             for generator in generators)
+                for base in itertools.product([0, 1], repeat=base_factors)]
@@ -0,0 +1,29 @@
+import random
+from typing import List, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConfigValidator.Config.Models.DesignModel import DesignModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+
+
+class LatinHypercubeDesign(DesignModel):
+    """Latin hypercube sampling of `samples` treatment combinations: the range of every factor is split into `samples`
+    equally likely strata, which are each sampled once, so that every factor is covered evenly by few runs. Intended
+    for numeric factors whose treatments are listed in order; samples that end up in the same treatment combination
+    are performed once. The sample is reproducible through its `seed`, which a restarted experiment relies on."""
+
+    def __init__(self, samples: int, seed: int = 0):
+        if samples < 1:
+            raise BaseError("A latin hypercube design requires at least 1 sample!")
+
+        self.samples = samples
+        self.seed = seed
+
+    def generate_cells(self, factors: List[FactorModel]) -> List[Tuple[int, ...]]:
+        rng = random.Random(self.seed)
+        columns = []
+        for factor in factors:
+            strata = list(range(self.samples))
+            rng.shuffle(strata)
+            columns.append([int((stratum + rng.random()) / self.samples * len(factor.treatments)) for stratum in strata])
+        return list(dict.fromkeys(zip(*columns)))
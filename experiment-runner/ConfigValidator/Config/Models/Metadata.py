@@ -1,9 +1,16 @@
+from typing import Dict, Optional
 
 
 class Metadata:
+    # Metadata stored before the fingerprints were introduced does not hold them
+    _method_fingerprints: Optional[Dict[str, str]] = None
+    _attribute_fingerprints: Optional[Dict[str, str]] = None
 
-    def __init__(self, md5sum: bytes):
+    def __init__(self, md5sum: bytes, method_fingerprints: Optional[Dict[str, str]] = None,
+                 attribute_fingerprints: Optional[Dict[str, str]] = None):
         self._md5sum = md5sum
+        self._method_fingerprints = method_fingerprints
+        self._attribute_fingerprints = attribute_fingerprints
 
     @property
     def md5sum(self):
@@ -12,3 +19,13 @@ class Metadata:
     @md5sum.setter
     def md5sum(self, md5sum: bytes):
         self._md5sum = md5sum
+
+    @property
+    def method_fingerprints(self) -> Optional[Dict[str, str]]:
+        """The AST md5sum of every method (hook) of the config, and function of the config file, by name."""
+        return self._method_fingerprints
+
+    @property
+    def attribute_fingerprints(self) -> Optional[Dict[str, str]]:
+        """The md5sum of the value of every attribute of the config, by name."""
+        return self._attribute_fingerprints
@@ -0,0 +1,40 @@
+import itertools
+from typing import List, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConfigValidator.Config.Models.DesignModel import DesignModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+
+
+class OrthogonalArrayDesign(DesignModel):
+    """An orthogonal array of the given `strength`: every combination of the treatments of any `strength` factors
+    occurs equally often (e.g. the L9 array for 4 factors with 3 treatments, in 9 instead of 81 runs).
+    The factors must have the same, prime, number of treatments s, and there can be at most s + 1 of them
+    (Bush construction, s ** strength runs)."""
+
+    def __init__(self, strength: int = 2):
+        if strength < 2:
+            raise BaseError("The strength of an orthogonal array must be at least 2!")
+
+        self.strength = strength
+
+    def generate_cells(self, factors: List[FactorModel]) -> List[Tuple[int, ...]]:
+        levels = len(factors[0].treatments)
+        if any(len(factor.treatments) != levels for factor in factors):
+            raise BaseError("The factors of an orthogonal array must have the same number of treatments!")
+        if levels < 2 or any(levels % divisor == 0 for divisor in range(2, levels)):
+            raise BaseError(f"The factors of an orthogonal array must have a prime number of treatments, not {levels}!")
+        if self.strength >= len(factors):
+            return list(itertools.product(range(levels), repeat=len(factors)))  # only the full factorial has this strength
+        if len(factors) > levels + 1 or self.strength > levels:
+            raise BaseError(f"An orthogonal array of strength {self.strength} holds at most {levels + 1} factors "
+                            f"with {levels} treatments!")
+
+        # Every row is a polynomial of degree < strength over GF(levels), the columns are its values in every element
+        # of the field, and its leading coefficient (the value "at infinity")
+        cells = []
+        for coefficients in itertools.product(range(levels), repeat=self.strength):
+            row = [sum(c * x ** i for i, c in enumerate(coefficients)) % levels for x in range(levels)]
+            row.append(coefficients[-1])
+            cells.append(tuple(row[:len(factors)]))
+        return cells
@@ -0,0 +1,74 @@
+import math
+import statistics
+from typing import List, Optional
+
+from scipy import stats
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class RepetitionModel:
+    """Repeats every treatment combination (cell) of the run table at least `min_repetitions` and at most
+    `max_repetitions` times. The repetition of a run is stored in the `__repetition` column of the run table.
+
+    If a stopping rule is given, the remaining repetitions of a cell are skipped as soon as the values of `data_column`
+    (as returned by `populate_run_data`) of its completed runs have converged:
+      - `max_relative_standard_error`: the standard error of the mean, relative to the mean, is at most this value.
+      - `max_ci_half_width`: the half-width of the `confidence` interval of the mean is at most this value.
+    If both are given, both must hold."""
+
+    def __init__(self,
+                 min_repetitions: int,
+                 max_repetitions: int,
+                 data_column: Optional[str] = None,
+                 max_relative_standard_error: Optional[float] = None,
+                 max_ci_half_width: Optional[float] = None,
+                 confidence: float = 0.95
+                 ):
+        if min_repetitions < 1 or max_repetitions < min_repetitions:
+            raise BaseError("The repetitions must satisfy 1 <= min_repetitions <= max_repetitions!")
+
+        if (max_relative_standard_error is not None or max_ci_half_width is not None) and data_column is None:
+            raise BaseError("A stopping rule for the repetitions requires a data column!")
+
+        if self.__has_rule(max_relative_standard_error, max_ci_half_width) and min_repetitions < 2:
+            raise BaseError("A stopping rule for the repetitions requires at least 2 min_repetitions!")
+
+        if not 0 < confidence < 1:
+            raise BaseError("The confidence of the stopping rule must lie between 0 and 1!")
+
+        self.min_repetitions = min_repetitions
+        self.max_repetitions = max_repetitions
+        self.data_column = data_column
+        self.max_relative_standard_error = max_relative_standard_error
+        self.max_ci_half_width = max_ci_half_width
+        self.confidence = confidence
+
+    @staticmethod
+    def __has_rule(max_relative_standard_error, max_ci_half_width) -> bool:
+        return max_relative_standard_error is not None or max_ci_half_width is not None
+
+    def stops_early(self) -> bool:
+        return self.__has_rule(self.max_relative_standard_error, self.max_ci_half_width) \
+               and self.min_repetitions < self.max_repetitions
+
+    def has_converged(self, values: List[float]) -> bool:
+        """Whether the repetitions of a cell, with `values` as the data column of its completed runs, may stop."""
+        n = len(values)
+        if n >= self.max_repetitions:
+            return True
+        if not self.stops_early() or n < self.min_repetitions:
+            return False
+
+        mean = statistics.mean(values)
+        standard_error = statistics.stdev(values) / math.sqrt(n)
+
+        if self.max_relative_standard_error is not None:
+            if mean == 0 or standard_error / abs(mean) > self.max_relative_standard_error:
+                return False
+
+        if self.max_ci_half_width is not None:
+            if stats.t.ppf((1 + self.confidence) / 2, n - 1) * standard_error > self.max_ci_half_width:
+                return False
+
+        return True
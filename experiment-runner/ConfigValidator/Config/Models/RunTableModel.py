@@ -1,20 +1,47 @@
+import math
 import itertools
 import random
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.RunRecord import RunRecord
 from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RepetitionModel import RepetitionModel
+from ConfigValidator.Config.Models.DesignModel import DesignModel
 
 
 class RunTableModel:
     def __init__(self,
                  factors: List[FactorModel],
-                 exclude_variations: List[Dict[FactorModel, List[SupportsStr]]] = None,
+                 exclude_variations: List[Union[Dict[FactorModel, List[SupportsStr]],
+                                                Callable[[Dict[str, SupportsStr]], bool]]] = None,
                  data_columns: List[str] = None,
-                 shuffle: bool = False
+                 shuffle: bool = False,
+                 transition_costs: Dict[FactorModel, Union[float, Callable[[SupportsStr, SupportsStr], float]]] = None,
+                 repetitions: Optional[RepetitionModel] = None,
+                 design: Optional[DesignModel] = None,
+                 data_column_dtypes: Dict[str, type] = None
                  ):
+        """`exclude_variations` lists the treatment combinations to leave out of the run table, either as the treatments
+        per factor (all combinations of these are excluded), or as a predicate on the treatments of a run by factor
+        name, e.g. `lambda run: run['cpu_quota'] > run['threads']`.
+
+        `transition_costs` optionally gives the setup cost of changing the treatment of a factor between two
+        consecutive runs, either as a constant or as a function of the (from, to) treatments. If given, the runs are
+        ordered such that expensive transitions happen as little as possible. Runs that share the treatments of all
+        these factors form a block, if `shuffle` is set only the runs within each block are shuffled.
+
+        `repetitions` optionally repeats every treatment combination, possibly stopping early once the results of its
+        runs converged (see `RepetitionModel`).
+
+        `design` optionally only selects some treatment combinations of the full factorial, e.g. a
+        `FractionalFactorialDesign`, `LatinHypercubeDesign` or `OrthogonalArrayDesign`. Exclusions, repetitions and
+        ordering apply to the selected combinations.
+
+        `data_column_dtypes` optionally gives the type (str, int, float or bool) of data columns, as read back from the
+        stored run table. The values of other data columns are read back as int or float if they are numeric."""
         if exclude_variations is None:
             exclude_variations = {}
         if data_columns is None:
@@ -26,10 +53,50 @@ class RunTableModel:
         if len(set(data_columns)) != len(data_columns):
             raise BaseError("Duplicate data column detected!")
 
+        if transition_costs is None:
+            transition_costs = {}
+        for factor in transition_costs:
+            if factor not in factors:
+                raise BaseError(f"Transition costs given for unknown factor {factor.factor_name}!")
+
+        if data_column_dtypes is None:
+            data_column_dtypes = {}
+        for data_column, dtype in data_column_dtypes.items():
+            if data_column not in data_columns:
+                raise BaseError(f"Dtype given for unknown data column {data_column}!")
+            if dtype not in FactorModel.DTYPES:
+                raise BaseError(f"Unsupported dtype {dtype} for data column {data_column}!")
+
+        if repetitions is not None and repetitions.data_column is not None \
+                and repetitions.data_column not in data_columns:
+            raise BaseError(f"The stopping rule of the repetitions uses unknown data column {repetitions.data_column}!")
+
+        for exclusion in exclude_variations:
+            if callable(exclusion):
+                continue
+            for factor in exclusion:
+                if factor not in factors:
+                    raise BaseError(f"Exclusion given for unknown factor {factor.factor_name}!")
+
         self.__factors = factors
         self.__exclude_variations = exclude_variations
         self.__data_columns = data_columns
         self.__shuffle = shuffle
+        self.__transition_costs = transition_costs
+        self.__repetitions = repetitions
+        self.__data_column_dtypes = data_column_dtypes
+        self.__runner_columns: Dict[str, Optional[type]] = {}
+        self.__compile_exclusions()
+
+        # The cells of the design, by their index in the full factorial
+        self.__design_cells = None
+        if design is not None:
+            self.__design_cells = set()
+            for cell in design.generate_cells(factors):
+                cell_index = 0
+                for factor, digit in zip(factors, cell):
+                    cell_index = cell_index * len(factor.treatments) + digit
+                self.__design_cells.add(cell_index)
 
     def get_factors(self) -> List[FactorModel]:
         return self.__factors
@@ -37,55 +104,188 @@ class RunTableModel:
     def get_data_columns(self) -> List[str]:
         return self.__data_columns
 
-    def generate_experiment_run_table(self) -> List[Dict]:
-        def __filter_list(full_list: List[Tuple]):
-            if len(self.__exclude_variations) == 0:
-                return full_list
-
-            to_remove_indices = []
-            for exclusion in self.__exclude_variations:
-                # Construct the exclusion tuples
-                list_of_lists = []
-                indexes = []
-                for factor, treatment_list in exclusion.items():
-                    list_of_lists.append(treatment_list)
-                    indexes.append(self.__factors.index(factor))
-                exclude_combinations_list = list(itertools.product(*list_of_lists))
-
-                # Mark the exclusions in the full table
-                for idx, elem in enumerate(full_list):
-                    for exclude_combo in exclude_combinations_list:
-                        if all([exclude_combo[i] == elem[indexes[i]] for i in range(len(indexes))]):
-                            to_remove_indices.append(idx)
-
-            to_remove_indices.sort(reverse=True)
-            for idx in to_remove_indices:
-                del full_list[idx]
-            return full_list
-
-        list_of_lists = [factor.treatments for factor in self.__factors]
-        combinations_list = list(itertools.product(*list_of_lists))
-        filtered_list = __filter_list(combinations_list)
+    def get_repetitions(self) -> Optional[RepetitionModel]:
+        return self.__repetitions
+
+    def get_cell(self, run: Dict) -> Tuple:
+        """The treatment combination of a run, which is shared by all its repetitions."""
+        return tuple(str(run[factor.factor_name]) for factor in self.__factors)
+
+    def get_runner_columns(self) -> List[str]:
+        return list(self.__runner_columns)
+
+    def add_runner_column(self, column_name: str, dtype: Optional[type] = None):
+        """Adds a column managed by experiment-runner itself (e.g. `__cooldown_ms`) to the run table."""
+        if column_name in self.__runner_columns:
+            raise BaseError(f"Duplicate runner column {column_name} detected!")
+        self.__runner_columns[column_name] = dtype
+
+    def get_column_dtypes(self) -> Dict[str, Optional[type]]:
+        """The type of every column of the run table, None for (data) columns of which it is not known."""
+        dtypes = {'__run_id': str, '__done': RunProgress}
+        dtypes.update((factor.factor_name, factor.dtype) for factor in self.__factors)
+        if self.__repetitions:
+            dtypes['__repetition'] = int
+        dtypes.update((data_column, self.__data_column_dtypes.get(data_column)) for data_column in self.__data_columns)
+        dtypes.update(self.__runner_columns)
+        return dtypes
+
+    def __factor_transition_cost(self, factor: FactorModel, from_treatment, to_treatment) -> float:
+        if from_treatment == to_treatment:
+            return 0
+        cost = self.__transition_costs.get(factor, 0)
+        return cost(from_treatment, to_treatment) if callable(cost) else cost
 
+    def get_transition_cost(self, from_run: Dict, to_run: Dict) -> float:
+        """The setup cost of performing run `to_run` directly after run `from_run`."""
+        return sum(self.__factor_transition_cost(factor, from_run[factor.factor_name], to_run[factor.factor_name])
+                   for factor in self.__transition_costs)
+
+    def __order_by_transition_cost(self, run_table: List[Dict]) -> List[Dict]:
+        # Factors with the most expensive transitions change least often: they are the outermost when ordering
+        def average_cost(factor: FactorModel) -> float:
+            pairs = list(itertools.permutations(factor.treatments, 2))
+            return sum(self.__factor_transition_cost(factor, a, b) for a, b in pairs) / max(len(pairs), 1)
+        costly_factors = sorted(self.__transition_costs.keys(), key=average_cost, reverse=True)
+
+        # Visit the treatments of a factor along the cheapest path (greedy nearest neighbour)
+        treatment_orders = {}
+        for factor in costly_factors:
+            remaining = list(factor.treatments)
+            path = [remaining.pop(0)]
+            while remaining:
+                cheapest = min(remaining, key=lambda t: self.__factor_transition_cost(factor, path[-1], t))
+                remaining.remove(cheapest)
+                path.append(cheapest)
+            treatment_orders[factor] = path
+
+        # Snake through the blocks: every other block of an outer treatment visits the inner treatments in reverse
+        # order, so that crossing from one block to the next only changes the outer factor.
+        def snake(runs: List[Dict], factors: List[FactorModel]) -> List[Dict]:
+            if not factors:
+                if self.__shuffle:
+                    random.shuffle(runs)
+                return runs
+
+            factor, ordered = factors[0], []
+            for i, treatment in enumerate(treatment_orders[factor]):
+                block = snake([run for run in runs if run[factor.factor_name] == treatment], factors[1:])
+                ordered.extend(reversed(block) if i % 2 == 1 else block)
+            return ordered
+
+        return snake(run_table, costly_factors)
+
+    def __radices(self) -> List[int]:
+        radices = [len(factor.treatments) for factor in self.__factors]
+        if self.__repetitions:
+            radices.append(self.__repetitions.max_repetitions)
+        return radices
+
+    def get_design_size(self) -> int:
+        """The number of runs of the full factorial, including those of excluded treatment combinations (or those that
+        are not part of the design)."""
+        return math.prod(self.__radices())
+
+    def __column_positions(self) -> Dict[str, int]:
         column_names = ['__run_id', '__done']  # Needed for experiment-runner functionality
+        column_names.extend(factor.factor_name for factor in self.__factors)
+        if self.__repetitions:
+            column_names.append('__repetition')
+        return RunRecord.positions_of(column_names + self.__data_columns + list(self.__runner_columns))
+
+    def __compile_exclusions(self):
+        # The exclusions by treatments are compiled into a bitmask per treatment of every factor, with the bits set of
+        # the exclusions that either do not constrain the factor, or list the treatment. A treatment combination is
+        # excluded if any bit survives AND-ing the masks of its treatments: one lookup per factor, for any number of
+        # exclusions.
+        treatment_exclusions = [exclusion for exclusion in self.__exclude_variations if not callable(exclusion)]
+        self.__exclusion_predicates: List[Callable[[Dict[str, SupportsStr]], bool]] = \
+            [exclusion for exclusion in self.__exclude_variations if callable(exclusion)]
+        self.__all_exclusions_mask = (1 << len(treatment_exclusions)) - 1
+        self.__exclusion_masks: List[Dict[SupportsStr, int]] = []
         for factor in self.__factors:
-            column_names.append(factor.factor_name)
+            masks = {}
+            for treatment in factor.treatments:
+                masks[treatment] = sum(1 << i for i, exclusion in enumerate(treatment_exclusions)
+                                       if factor not in exclusion or treatment in exclusion[factor])
+            self.__exclusion_masks.append(masks)
+
+    def __is_excluded(self, combo: Tuple) -> bool:
+        if self.__all_exclusions_mask:
+            mask = self.__all_exclusions_mask
+            for masks, treatment in zip(self.__exclusion_masks, combo):
+                mask &= masks[treatment]
+                if not mask:
+                    break
+            else:
+                return True
+        if self.__exclusion_predicates:
+            run = {factor.factor_name: treatment for factor, treatment in zip(self.__factors, combo)}
+            return any(predicate(run) for predicate in self.__exclusion_predicates)
+        return False
+
+    def __create_run(self, column_positions: Dict[str, int], index: int, combo: Tuple) -> RunRecord:
+        empty_columns = (" ",) * (len(self.__data_columns) + len(self.__runner_columns))
+        return RunRecord(column_positions, [f'run_{index}', RunProgress.TODO, *combo, *empty_columns])
+
+    def get_run(self, run_id: str) -> Optional[RunRecord]:
+        """The (new) run with the given id, or None if its treatment combination is excluded (or not part of the design).
+        The id of a run is its index in the full factorial, whose digits (in the mixed radix of the numbers of treatments
+        of the factors, and the number of repetitions) are the indices of its treatments, so no other run is generated."""
+        try:
+            index = int(run_id.split('_')[-1])
+        except ValueError:
+            raise BaseError(f"Invalid run id {run_id}!")
+        if not 0 <= index < self.get_design_size():
+            raise BaseError(f"Run {run_id} is not part of the run table!")
+
+        digits = []
+        remainder = index
+        for radix in reversed(self.__radices()):
+            remainder, digit = divmod(remainder, radix)
+            digits.append(digit)
+        digits.reverse()
+
+        if self.__design_cells is not None and index // (self.__repetitions.max_repetitions if self.__repetitions else 1) \
+                not in self.__design_cells:
+            return None
+        combo = tuple(factor.treatments[digit] for factor, digit in zip(self.__factors, digits))
+        if self.__is_excluded(combo):
+            return None
+        if self.__repetitions:
+            combo += (digits[-1] + 1,)
+        return self.__create_run(self.__column_positions(), index, combo)
 
-        if self.__data_columns:
-            for data_column in self.__data_columns:
-                column_names.append(data_column)
+    def __iter_cells(self) -> Iterator[Tuple[int, Tuple]]:
+        if self.__design_cells is None:
+            yield from enumerate(itertools.product(*[factor.treatments for factor in self.__factors]))
+            return
 
-        experiment_run_table = []
-        for i, combo in enumerate(filtered_list):
-            row_list = list(combo)
-            row_list.insert(0, f'run_{i}')  # __run_id
-            row_list.insert(1, RunProgress.TODO)  # __done
+        for cell_index in sorted(self.__design_cells):
+            combo, remainder = [], cell_index
+            for factor in reversed(self.__factors):
+                remainder, digit = divmod(remainder, len(factor.treatments))
+                combo.append(factor.treatments[digit])
+            yield cell_index, tuple(reversed(combo))
 
-            if self.__data_columns:
-                for _ in self.__data_columns:
-                    row_list.append(" ")
-            experiment_run_table.append(dict(zip(column_names, row_list)))
+    def iter_runs(self) -> Iterator[RunRecord]:
+        """Lazily generates the runs of the run table in the order of the design (neither shuffled nor ordered by
+        transition cost), so that large designs can be filtered or sampled without creating all runs."""
+        column_positions = self.__column_positions()  # shared by all runs
+        repetitions = self.__repetitions.max_repetitions if self.__repetitions else 1
+        for cell_index, combo in self.__iter_cells():
+            if self.__is_excluded(combo):
+                continue
+            if not self.__repetitions:
+                yield self.__create_run(column_positions, cell_index, combo)
+                continue
+            for repetition in range(repetitions):
+                yield self.__create_run(column_positions, cell_index * repetitions + repetition, combo + (repetition + 1,))
 
-        if self.__shuffle:
+    def generate_experiment_run_table(self) -> List[RunRecord]:
+        experiment_run_table = list(self.iter_runs())
+        if self.__transition_costs:
+            experiment_run_table = self.__order_by_transition_cost(experiment_run_table)
+        elif self.__shuffle:
             random.shuffle(experiment_run_table)
         return experiment_run_table
@@ -1,9 +1,55 @@
+import time
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
 
 class RunnerContext:
 
-    def __init__(self, run_variation: dict, run_nr: int, run_dir: Path):
+    def __init__(self, run_variation: dict, run_nr: int, run_dir: Path, host: Optional[str] = None):
         self.run_variation = run_variation
         self.run_nr = run_nr
         self.run_dir = run_dir
+        self.host = host
+        self.time_to_ready: Dict[str, float] = {}
+        # The (probe name, started_at, time-to-ready in ms) of the waits that are not yet stored in phase_timings.csv
+        self.ready_timings: List[Tuple[str, float, float]] = []
+
+    def wait_until(self,
+                   probe: Callable[[], bool],
+                   timeout_in_s: float,
+                   interval_in_s: float = 5,
+                   backoff: float = 1.0,
+                   max_interval_in_s: float = 60,
+                   name: Optional[str] = None
+                   ) -> bool:
+        """Polls `probe` until it returns True, or until `timeout_in_s` seconds have passed.
+        After every failed poll, the polling interval is multiplied by `backoff` (up to `max_interval_in_s`).
+        A probe raising an exception counts as not ready. Returns whether the probe succeeded.
+        The time-to-ready is logged, kept in `self.time_to_ready[name]` and stored in phase_timings.csv (as phase
+        `READY <name>`), e.g. ContainerCount, see `Plugins.Probes.ReadinessProbes`"""
+        name = name or getattr(probe, '__name__', type(probe).__name__)
+        output.console_log(f"Waiting at most {timeout_in_s}s until {name} is ready...")
+
+        started_at, start = time.time(), time.monotonic()
+        interval = interval_in_s
+        while True:
+            try:
+                ready = bool(probe())
+            except Exception as e:
+                output.console_log(f"Readiness probe {name} failed: {e}")
+                ready = False
+
+            elapsed = time.monotonic() - start
+            if ready:
+                self.time_to_ready[name] = elapsed
+                self.ready_timings.append((name, started_at, elapsed * 1000))
+                output.console_log_OK(f"{name} ready after {elapsed:.1f}s")
+                return True
+            if elapsed >= timeout_in_s:
+                output.console_log_FAIL(f"{name} not ready after {elapsed:.1f}s")
+                return False
+
+            time.sleep(min(interval, timeout_in_s - elapsed))
+            interval = min(interval * backoff, max_interval_in_s)
@@ -4,6 +4,7 @@ from ConfigValidator.Config.Models.RunTableModel import RunTableModel
 from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
@@ -31,6 +32,81 @@ class RunnerConfig:
     This can be essential to accommodate for cooldown periods on some systems."""
     time_between_runs_in_ms:    int             = 1000
 
+    """Optionally, a policy that ends the cooldown after a run as soon as a probed metric is stable, instead of always
+    waiting `time_between_runs_in_ms` (which is then used as the maximum cooldown). The actual cooldown time of each run
+    is stored in the `__cooldown_ms` column of the run table. With a pool of `hosts`, every host uses its own (deep) copy
+    of the policy and its probe.
+    e.g. CooldownPolicy(CPUUtilisation(), tolerance=2.0, min_cooldown_in_ms=30000), see `Plugins.Probes.MetricProbes`"""
+    cooldown_policy:            Optional[CooldownPolicy] = None
+
+    """The Systems Under Test (hosts) on which the runs are performed. If more than one host is given, the pending runs
+    are dispatched to whichever host is free, so that runs on different hosts are performed at the same time.
+    The host of the current run is available in the hooks as `context.host`.
+    Leave empty to perform all runs one after another on a single system."""
+    hosts:                      List[str]       = []
+
+    """If True, the cooldown (`time_between_runs_in_ms`) starts as soon as the run is stopped (`stop_run`), and the run data
+    is collected (`populate_run_data`) and stored during the cooldown. The next run only starts once both are finished."""
+    populate_during_cooldown:   bool            = False
+
+    """If True, all runs (on a host) are performed by one long-lived worker process, instead of spawning new processes
+    for every run. Any attribute the hooks set on the config, or change in place (e.g. appending to a list), is reset
+    before each run, and `before_run` is called in the worker as well. A crashed worker is restarted for the next run.
+    The attributes of the config are deep-copied for this: create the ones that cannot be copied (e.g. an open
+    connection) in the hooks of the run (from `before_run` on) instead.
+    This saves the process creation overhead, which matters for experiments with many short runs."""
+    persistent_run_worker:      bool            = False
+
+    """The names of the factors whose treatments define a group. Consecutive runs (on a host) with the same treatments
+    for these factors form a group, which shares e.g. a deployment of the target system: `before_group` is called
+    before its first run, `reset_run` between its runs, and `after_group` after its last run.
+    Order the runs (e.g. with `transition_costs`) such that runs of a group are consecutive. Leave empty for no groups."""
+    group_factors:              List[str]       = []
+
+    """Optionally, the maximum duration (in ms) of the hooks called during a run, per event.
+    e.g. {RunnerEvents.START_RUN: 10 * 60 * 1000, RunnerEvents.INTERACT: 30 * 60 * 1000}
+    A run whose hook exceeds its timeout is killed, `stop_measurement` and `stop_run` are called in a fresh context to
+    clean up, and the run is marked as FAILED, so that the experiment continues with the next run.
+    Only the hooks called in the run's process can be timed: from `reset_run` up to `populate_run_data`, and
+    `before_run` if `persistent_run_worker` is True."""
+    phase_timeouts_in_ms:       Dict[RunnerEvents, int] = {}
+
+    """The number of times a failed run (a hook raised, or a phase exceeded its timeout) is retried in the same session.
+    Failed runs are retried after all other runs, the number of attempts and the reason of the last failure of each run
+    are stored in the `__attempts` and `__failure` columns of the run table. Runs that still failed are marked as FAILED."""
+    run_retries:                int             = 0
+
+    """The time to wait before retrying the failed runs, doubled for every next round of retries."""
+    retry_backoff_in_ms:        int             = 0
+
+    """Optionally, the time (in ms) that this invocation of the experiment may take. A run is only started if it is
+    expected to end within the budget, judging by the durations of the runs performed so far (preferably those with the
+    same treatments), so that the experiment stops before the deadline without a half-finished run and can be resumed by
+    restarting it. The pending runs are interleaved over the treatment combinations, so that each gets its share of runs.
+    Runs are only interleaved within a group (see `group_factors`), and between runs without a transition cost (see
+    `RunTableModel`), so that groups and the order of costly transitions are kept."""
+    time_budget_in_ms:          Optional[int]   = None
+
+    """Optionally, a folder shared by experiments in which the results of completed runs are cached. A run is not performed
+    if a result was cached for the same treatments (and repetition), System Under Test and config: the hooks and functions
+    in the config file, except `after_group` and `after_experiment`, and the config attributes that may influence the
+    results (e.g. not `name`, `hosts` or `run_retries`). Its run data is taken from the cache instead, and the run folder
+    it was measured in is stored in the `__cached_from` column of the run table.
+    e.g. a fork of the config that adds treatments reuses the results of the treatments it shares with the original."""
+    result_cache_path:          Optional[Path]  = None
+
+    """The maximum age (in ms) of the cached results that are reused, older results are measured again. None: no limit."""
+    result_cache_max_age_in_ms: Optional[int]   = None
+
+    """Identifies the System Under Test in the result cache, results are only reused for the same System Under Test.
+    Defaults to the host of the run (see `hosts`), or else the name of this machine."""
+    system_under_test:          Optional[str]   = None
+
+    """The expected duration (in ms) of the hooks, per event, for `--simulate`. Only used for the events of which no
+    durations were recorded (in phase_timings.csv) by an earlier invocation of the experiment.
+    e.g. {RunnerEvents.START_RUN: 2 * 60 * 1000, RunnerEvents.INTERACT: 25 * 60 * 1000}"""
+    simulated_phase_durations_in_ms: Dict[RunnerEvents, int] = {}
+
     # Dynamic configurations can be one-time satisfied here before the program takes the config as-is
     # e.g. Setting some variable based on some criteria
     def __init__(self):
@@ -38,13 +114,16 @@ class RunnerConfig:
 
         EventSubscriptionController.subscribe_to_multiple_events([
             (RunnerEvents.BEFORE_EXPERIMENT, self.before_experiment),
+            (RunnerEvents.BEFORE_GROUP     , self.before_group     ),
             (RunnerEvents.BEFORE_RUN       , self.before_run       ),
+            (RunnerEvents.RESET_RUN        , self.reset_run        ),
             (RunnerEvents.START_RUN        , self.start_run        ),
             (RunnerEvents.START_MEASUREMENT, self.start_measurement),
             (RunnerEvents.INTERACT         , self.interact         ),
             (RunnerEvents.STOP_MEASUREMENT , self.stop_measurement ),
             (RunnerEvents.STOP_RUN         , self.stop_run         ),
             (RunnerEvents.POPULATE_RUN_DATA, self.populate_run_data),
+            (RunnerEvents.AFTER_GROUP      , self.after_group      ),
             (RunnerEvents.AFTER_EXPERIMENT , self.after_experiment )
         ])
         self.run_table_model = None  # Initialized later
@@ -61,6 +140,7 @@ class RunnerConfig:
             exclude_variations=[
                 {factor1: ['example_treatment1']},                   # all runs having treatment "example_treatment1" will be excluded
                 {factor1: ['example_treatment2'], factor2: [True]},  # all runs having the combination ("example_treatment2", True) will be excluded
+                # lambda run: run['example_factor1'] == 'example_treatment3' and not run['example_factor2'],  # a predicate on the treatments
             ],
             data_columns=['avg_cpu', 'avg_mem']
         )
@@ -72,12 +152,25 @@ class RunnerConfig:
 
         output.console_log("Config.before_experiment() called!")
 
+    def before_group(self, context: RunnerContext) -> None:
+        """Perform any activity required before the first run of a group (see `group_factors`) here.
+        For example, deploying the target system once for all runs of the group.
+        The context is the one of the first run of the group."""
+
+        output.console_log("Config.before_group() called!")
+
     def before_run(self) -> None:
         """Perform any activity required before starting a run.
         No context is available here as the run is not yet active (BEFORE RUN)"""
 
         output.console_log("Config.before_run() called!")
 
+    def reset_run(self, context: RunnerContext) -> None:
+        """Perform any activity required between two runs of the same group (see `group_factors`) here.
+        For example, resetting the state of the target system deployed in `before_group`."""
+
+        output.console_log("Config.reset_run() called!")
+
     def start_run(self, context: RunnerContext) -> None:
         """Perform any activity required for starting the run here.
         For example, starting the target system to measure.
@@ -113,6 +206,13 @@ class RunnerConfig:
         output.console_log("Config.populate_run_data() called!")
         return None
 
+    def after_group(self, context: RunnerContext) -> None:
+        """Perform any activity required after the last run of a group (see `group_factors`) here.
+        For example, tearing down the target system deployed in `before_group`.
+        The context is the one of the last run of the group."""
+
+        output.console_log("Config.after_group() called!")
+
     def after_experiment(self) -> None:
         """Perform any activity required after stopping the experiment here
         Invoked only once during the lifetime of the program."""
@@ -5,6 +5,8 @@ from ExperimentOrchestrator.Misc.DictConversion import class_to_dict
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
+from EventManager.Models.RunnerEvents import RunnerEvents
 from ConfigValidator.CustomErrors.ConfigErrors import (ConfigInvalidError, ConfigAttributeInvalidError)
 
 class ConfigValidator:
@@ -19,8 +21,28 @@ class ConfigValidator:
                                                     f"\n\n{ConfigAttributeInvalidError(name, value, expected)}"
             ConfigValidator.error_found = True
 
+    @staticmethod
+    def __set_default_if_missing(config: RunnerConfig, name: str):
+        # Configs created before an attribute was introduced fall back to the default of the template config
+        if not hasattr(config, name):
+            setattr(config, name, getattr(RunnerConfig, name))
+
     @staticmethod
     def validate_config(config: RunnerConfig):
+        # Optional attributes
+        ConfigValidator.__set_default_if_missing(config, 'hosts')
+        ConfigValidator.__set_default_if_missing(config, 'populate_during_cooldown')
+        ConfigValidator.__set_default_if_missing(config, 'cooldown_policy')
+        ConfigValidator.__set_default_if_missing(config, 'persistent_run_worker')
+        ConfigValidator.__set_default_if_missing(config, 'group_factors')
+        ConfigValidator.__set_default_if_missing(config, 'phase_timeouts_in_ms')
+        ConfigValidator.__set_default_if_missing(config, 'run_retries')
+        ConfigValidator.__set_default_if_missing(config, 'retry_backoff_in_ms')
+        ConfigValidator.__set_default_if_missing(config, 'time_budget_in_ms')
+        ConfigValidator.__set_default_if_missing(config, 'simulated_phase_durations_in_ms')
+        ConfigValidator.__set_default_if_missing(config, 'result_cache_path')
+        ConfigValidator.__set_default_if_missing(config, 'result_cache_max_age_in_ms')
+        ConfigValidator.__set_default_if_missing(config, 'system_under_test')
 
         # Runtime set experiment_path
         config.experiment_path = Path(str(config.results_output_path) + f"/{config.name}")
@@ -39,6 +61,86 @@ class ConfigValidator:
                                 (lambda a, b: not isinstance(a, b))
                             )
 
+        # cooldown_policy
+        ConfigValidator.__check_expression('cooldown_policy', config.cooldown_policy, "CooldownPolicy or None",
+                                (lambda a, b: a is not None and not isinstance(a, CooldownPolicy))
+                            )
+
+        # hosts
+        ConfigValidator.__check_expression('hosts', config.hosts, "list of unique host names (str)",
+                                (lambda a, b: not isinstance(a, list) or not all(isinstance(h, str) for h in a)
+                                              or len(set(a)) != len(a))
+                            )
+
+        # populate_during_cooldown
+        ConfigValidator.__check_expression('populate_during_cooldown', config.populate_during_cooldown, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+
+        # persistent_run_worker
+        ConfigValidator.__check_expression('persistent_run_worker', config.persistent_run_worker, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+
+        # group_factors
+        ConfigValidator.__check_expression('group_factors', config.group_factors, "list of factor names (str)",
+                                (lambda a, b: not isinstance(a, list) or not all(isinstance(f, str) for f in a))
+                            )
+
+        # phase_timeouts_in_ms
+        ConfigValidator.__check_expression('phase_timeouts_in_ms', config.phase_timeouts_in_ms, "dict of RunnerEvents to int",
+                                (lambda a, b: not isinstance(a, dict) or
+                                              not all(isinstance(k, RunnerEvents) and isinstance(v, int) for k, v in a.items()))
+                            )
+        # Only the phases performed in the run's process are supervised, the other hooks are called by experiment-runner itself
+        supervised_phases = [RunnerEvents.RESET_RUN, RunnerEvents.START_RUN, RunnerEvents.START_MEASUREMENT,
+                             RunnerEvents.INTERACT, RunnerEvents.STOP_MEASUREMENT, RunnerEvents.STOP_RUN,
+                             RunnerEvents.POPULATE_RUN_DATA]
+        if config.persistent_run_worker is True:
+            supervised_phases.append(RunnerEvents.BEFORE_RUN)
+        ConfigValidator.__check_expression('phase_timeouts_in_ms', config.phase_timeouts_in_ms,
+                                f"timeouts of the phases: {', '.join(phase.name for phase in supervised_phases)}",
+                                (lambda a, b: isinstance(a, dict) and any(k not in supervised_phases for k in a))
+                            )
+
+        # run_retries
+        ConfigValidator.__check_expression('run_retries', config.run_retries, "non-negative int",
+                                (lambda a, b: not isinstance(a, int) or a < 0)
+                            )
+
+        # retry_backoff_in_ms
+        ConfigValidator.__check_expression('retry_backoff_in_ms', config.retry_backoff_in_ms, "non-negative int",
+                                (lambda a, b: not isinstance(a, int) or a < 0)
+                            )
+
+        # time_budget_in_ms
+        ConfigValidator.__check_expression('time_budget_in_ms', config.time_budget_in_ms, "positive int or None",
+                                (lambda a, b: a is not None and (not isinstance(a, int) or a <= 0))
+                            )
+
+        # simulated_phase_durations_in_ms
+        ConfigValidator.__check_expression('simulated_phase_durations_in_ms', config.simulated_phase_durations_in_ms,
+                                "dict of RunnerEvents to int",
+                                (lambda a, b: not isinstance(a, dict) or
+                                              not all(isinstance(k, RunnerEvents) and isinstance(v, int) for k, v in a.items()))
+                            )
+
+        # result_cache_path
+        ConfigValidator.__check_expression('result_cache_path', config.result_cache_path, "Path or None",
+                                (lambda a, b: a is not None and not isinstance(a, Path))
+                            )
+
+        # result_cache_max_age_in_ms
+        ConfigValidator.__check_expression('result_cache_max_age_in_ms', config.result_cache_max_age_in_ms,
+                                "positive int or None",
+                                (lambda a, b: a is not None and (not isinstance(a, int) or a <= 0))
+                            )
+
+        # system_under_test
+        ConfigValidator.__check_expression('system_under_test', config.system_under_test, "str or None",
+                                (lambda a, b: a is not None and not isinstance(a, str))
+                            )
+
         # Results output path
         ConfigValidator.__check_expression("results_output_path", 
                             config.results_output_path,
@@ -4,6 +4,11 @@ class CommandNotRecognisedError(BaseError):
     def __init__(self):
         super().__init__("The command entered by the user is not recognised")
 
+class InvalidCommandArgumentsError(BaseError):
+    def __init__(self, command, params):
+        super().__init__(f"Invalid arguments for the command {command}" +
+                         f"\nUsage: python experiment-runner/ {command} {params}")
+
 class InvalidUserSpecifiedPathError(BaseError):
     def __init__(self, path):
         super().__init__("The user specified path is invalid or the user does not have the correct permissions" +
@@ -22,6 +22,16 @@ class ConnectionHandler:
         output.console_log(f"'{command_name}' command successfully executed")
         return 1
 
+    def get_remote_command_output(self, command):
+        con = self.connect_to_host()
+        try:
+            _, out, _ = con.exec_command(command)
+            command_output = out.read().decode().strip()
+        finally:
+            con.close()
+
+        return command_output
+
     def connect_to_host(self):
         host, username, password = self.get_credentials()
         # connect to server
@@ -46,10 +56,13 @@ class ConnectionHandler:
 
     def get_containers_count(self):
         conn = self.connect_to_host()
-        _, _, password = self.get_credentials()
-        _, number_of_containers_buf, err = conn.exec_command(f" echo {password} | sudo -S docker ps | wc -l")
-        number_of_containers = int(number_of_containers_buf.read().strip())
-        output.console_log(f"Found {number_of_containers} running after sleeping")
+        try:
+            _, _, password = self.get_credentials()
+            _, number_of_containers_buf, err = conn.exec_command(f" echo {password} | sudo -S docker ps | wc -l")
+            number_of_containers = int(number_of_containers_buf.read().strip())
+        finally:
+            conn.close()
+        output.console_log(f"Found {number_of_containers} running containers")
 
         return number_of_containers
 
@@ -2,7 +2,9 @@ from enum import Enum, auto
 
 class RunnerEvents(Enum):
     BEFORE_EXPERIMENT = auto()
+    BEFORE_GROUP      = auto()
     BEFORE_RUN        = auto()
+    RESET_RUN         = auto()
     START_RUN         = auto()
     START_MEASUREMENT = auto()
     INTERACT          = auto()
@@ -10,4 +12,5 @@ class RunnerEvents(Enum):
     STOP_MEASUREMENT  = auto()
     STOP_RUN          = auto()
     POPULATE_RUN_DATA = auto()
+    AFTER_GROUP       = auto()
     AFTER_EXPERIMENT  = auto()
@@ -1,15 +1,35 @@
+import os
+import copy
 import time
+import queue
+import socket
+import itertools
+import threading
 import multiprocessing
+import shutil
 import datetime
+from collections import Counter
+from multiprocessing.connection import Listener, AuthenticationError
+from typing import Callable, Dict, List, Optional, Tuple
 
 from ConfigValidator.Config.Models.Metadata import Metadata
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ProgressManager.Output.JSONOutputManager import JSONOutputManager
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.RunDurationModel import RunDurationModel
+from ProgressManager.RunTable.Models.RunTable import RunTable
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from EventManager.Models.RunnerEvents import RunnerEvents
 from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.ResultCache import ResultCache
 from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.Run.RunWorker import RunWorker
+from ExperimentOrchestrator.Experiment.RunTableShard import RunTableShard
+from ExperimentOrchestrator.Experiment.RunQueueClient import RunQueueClient
+from ExperimentOrchestrator.Misc.ProcessTree import kill_process_tree
+from ExperimentOrchestrator.Misc.ConfigFingerprint import (result_fingerprint, changed_fingerprints, OTHER_HOOKS,
+                                                            RESULT_NEUTRAL_ATTRIBUTES)
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from EventManager.EventSubscriptionController import EventSubscriptionController
@@ -22,6 +42,17 @@ from ConfigValidator.CustomErrors.ProgressErrors import AllRunsCompletedOnRestar
 ###     |       - Init and perform runs of correct type         |
 ###     |       - Perform experiment overhead                   |
 ###     |       - Perform run overhead (time_btwn_runs)         |
+###     |       - Dispatch runs over the host pool (if any)     |
+###     |       - Kill runs exceeding their phase timeouts      |
+###     |       - Retry failed runs at the end of the session   |
+###     |       - Skip the repetitions of converged cells       |
+###     |       - Only start runs that fit in the time budget   |
+###     |       - Record run durations, predict the ETA         |
+###     |       - Only perform the runs of its shard (if any)   |
+###     |       - Hand out runs to workers (coordinator), or    |
+###     |         perform the runs handed out (worker)          |
+###     |       - Take the results of runs from the result      |
+###     |         cache, or store them in it (if any)           |
 ###     |       - Signal experiment end (ClientRunner)          |
 ###     |                                                       |
 ###     |       * Experiment config that should be used         |
@@ -30,14 +61,63 @@ from ConfigValidator.CustomErrors.ProgressErrors import AllRunsCompletedOnRestar
 ###     |                                                       |
 ###     =========================================================
 class ExperimentController:
+    # The runs that still have to be performed, which the expected time left is computed for
+    PENDING_PROGRESS = [RunProgress.TODO, RunProgress.FAILED]
+    # The size of the run table journal from which it is compacted while the runs are performed
+    JOURNAL_COMPACTION_SIZE = 1024 * 1024
 
-    def __init__(self, config: RunnerConfig, metadata: Metadata):
+    def __init__(self, config: RunnerConfig, metadata: Metadata, shard: Optional[RunTableShard] = None,
+                 coordinator_address: Optional[Tuple[str, int]] = None, extend: bool = False):
         self.config = config
         self.metadata = metadata
 
+        # A worker stores the output of its runs in its own experiment folder, the coordinator owns the run table
+        if coordinator_address is not None:
+            self.config.experiment_path = self.config.experiment_path.with_name(
+                f"{self.config.experiment_path.name}_worker_{socket.gethostname()}_{os.getpid()}")
+            output.console_log_WARNING(f"Performing the runs handed out by the coordinator at {coordinator_address[0]}:"
+                                       f"{coordinator_address[1]}, the run output is stored in: {self.config.experiment_path} "
+                                       f"(a new folder for every start of the worker, its run folders are not copied to "
+                                       f"the coordinator)")
+
+        # A shard is a separate experiment, which only contains the runs of its slice of the run table
+        if shard is not None:
+            self.config.experiment_path = shard.experiment_path(self.config.experiment_path)
+            output.console_log_WARNING(f"Performing shard {shard.label} of the experiment in: {self.config.experiment_path}")
+
         self.csv_data_manager = CSVOutputManager(self.config.experiment_path)
         self.json_data_manager = JSONOutputManager(self.config.experiment_path)
-        self.run_table = self.config.create_run_table_model().generate_experiment_run_table()
+        run_table_model = self.config.create_run_table_model()
+        factor_names = [factor.factor_name for factor in run_table_model.get_factors()]
+        for group_factor in self.config.group_factors:
+            if group_factor not in factor_names:
+                raise BaseError(f"Group factor {group_factor} is not a factor of the run table!")
+        if self.config.cooldown_policy is not None:
+            run_table_model.add_runner_column('__cooldown_ms', int)
+        if self.config.run_retries > 0:
+            run_table_model.add_runner_column('__attempts', int)
+            run_table_model.add_runner_column('__failure', str)
+        if self.config.result_cache_path is not None:
+            run_table_model.add_runner_column('__cached_from', str)
+        self.run_table_model = run_table_model
+        self.__result_cache = None
+        if self.config.result_cache_path is not None:
+            self.__result_cache = ResultCache(self.config.result_cache_path, result_fingerprint(self.config), factor_names,
+                                              self.config.result_cache_max_age_in_ms)
+        # Every host of the pool cools down with its own copy of the policy, as its probe keeps state between samples
+        self.__cooldown_policies = {}
+        if self.config.cooldown_policy is not None and len(self.config.hosts) > 1:
+            self.__cooldown_policies = {host: copy.deepcopy(self.config.cooldown_policy) for host in self.config.hosts}
+        run_table = run_table_model.generate_experiment_run_table()
+        if shard is not None:
+            run_table = shard.select(run_table, run_table_model)
+        self.run_table = RunTable(run_table, run_table_model.get_cell)
+        self.__run_table_lock = threading.Lock()
+        self.__runs_in_progress = set()
+        self.__coordinator = None
+        if coordinator_address is not None:
+            # The config is identified by its md5sum, workers with a different config are refused
+            self.__coordinator = RunQueueClient(coordinator_address, self.metadata.md5sum, self.run_table)
 
         # Create experiment output folder, and in case that it exists, check if we can resume
         self.restarted = False
@@ -45,45 +125,48 @@ class ExperimentController:
             self.config.experiment_path.mkdir(parents=True, exist_ok=False)
         except FileExistsError:
             output.console_log_WARNING(f"Reusing already existing experiment path: {self.config.experiment_path}")
-            existing_run_table = self.csv_data_manager.read_run_table()
+            existing_run_table = self.csv_data_manager.read_run_table(self.run_table_model.get_column_dtypes())
+
+            # The stored md5sum for the code must match the current one, or the changes must be accepted
+            existing_metadata = self.json_data_manager.read_metadata()
+            if existing_metadata.md5sum != self.metadata.md5sum:
+                self.__accept_config_changes(existing_metadata, existing_run_table)
+                output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
+                self.json_data_manager.write_metadata(self.metadata)
+
+            if extend:
+                existing_run_table = self.__extend_run_table(existing_run_table)
 
             # First sanity check. If there is no "TODO" in the __done column, simply abort.
-            todo_run_found = any([variation['__done'] != RunProgress.DONE for variation in existing_run_table])
+            todo_run_found = any([variation['__done'] not in [RunProgress.DONE, RunProgress.SKIPPED]
+                                  for variation in existing_run_table])
             if not todo_run_found:
-                raise BaseError("The experiment was restarted, but all runs have already been completed.")
+                raise BaseError("The experiment was restarted, but all runs have already been completed. "
+                                "Use --extend to perform the runs of treatments added to the config.")
 
             # The experiment has been restarted as there is >=1 "TODO" variations in the CSV file
-            # In order to resume a previous experiment, the following conditions must hold true:
-            #   1. The column names of the stored run_table and the generated one must match
-            #   2. The stored md5sum for the code must match the current one
+            # In order to resume a previous experiment, the column names of the stored run_table and the generated one
+            # must match (the changes to the code were checked above)
 
             # check column names
             if not set(existing_run_table[0].keys()) == set(self.run_table[0].keys()):
                 raise BaseError("The generated run table from the config file, and the found run table in the CSV in "
-                                "the experiment output path, do not define the same columns!"
+                                "the experiment output path, do not define the same columns! "
+                                "Use --extend to keep the stored runs in the changed run table."
                                 )
-            # check md5sum
-            existing_metadata = self.json_data_manager.read_metadata()
-            if existing_metadata.md5sum != self.metadata.md5sum:  # check md5sum
-                cont = output.query_yes_no("md5sum mismatch! This can occur if the configuration code "
-                                           "has changed since the last run. Continue anyway?", default=None)
-                if not cont:
-                    raise BaseError("Aborting due to md5sum mismatch.")
-
-                output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
-                self.json_data_manager.write_metadata(self.metadata)
-
             self.restarted = True
-            assert(len(existing_run_table) == len(self.run_table))
+            if len(existing_run_table) != len(self.run_table):
+                raise BaseError("The generated run table from the config file has a different number of runs than the "
+                                "found run table in the CSV in the experiment output path! "
+                                "Use --extend to keep the stored runs in the changed run table.")
 
             # Re-order the generated run table to match the already existing one
-            tmp_run_table = []
-            for existing_var in existing_run_table:
-                for generated_var in self.run_table:
-                    if existing_var['__run_id'] == generated_var['__run_id']:
-                        tmp_run_table.append(generated_var)
-                        break
-            self.run_table = tmp_run_table
+            tmp_run_table = [self.run_table.get(existing_var['__run_id']) for existing_var in existing_run_table]
+            if None in tmp_run_table:
+                raise BaseError("The run ids of the generated run table, and the found run table in the CSV in the "
+                                "experiment output path, do not match! "
+                                "Use --extend to match the stored runs by their treatments instead.")
+            self.run_table = RunTable(tmp_run_table, run_table_model.get_cell)
             for existing_var, generated_var in zip(existing_run_table, self.run_table):
                 assert(existing_var['__run_id'] == generated_var['__run_id'])
 
@@ -93,12 +176,12 @@ class ExperimentController:
             for existing_var, generated_var in zip(existing_run_table, self.run_table):
                 assert (existing_var['__run_id'] == generated_var['__run_id'])
 
-                for k in map(lambda factor: factor.factor_name,
-                             self.config.run_table_model.get_factors()):  # treatment levels remain the same
-                    assert (str(generated_var[k]) == str(existing_var[k]))
+                for factor in self.config.run_table_model.get_factors():  # treatment levels remain the same
+                    assert (factor.dtype(generated_var[factor.factor_name]) == existing_var[factor.factor_name])
 
                 for k in set(self.config.run_table_model.get_data_columns()).union(
-                        ['__done']):  # update data columns and __done column
+                        self.config.run_table_model.get_runner_columns(),
+                        ['__done']):  # update data columns, runner columns and __done column
                     generated_var[k] = existing_var[k]
 
             output.console_log_WARNING(">> WARNING << -- Experiment is restarted!")
@@ -108,8 +191,128 @@ class ExperimentController:
 
         output.console_log_WARNING("Experiment run table created...")
 
-    def do_experiment(self):
+    def __accept_config_changes(self, existing_metadata: Metadata, existing_run_table: List[Dict]):
+        """Reports which hooks and attributes of the config changed since the stored run table was created. Completed
+        runs are only stale if a hook (or function) of the measurement, or an attribute that may influence the results
+        changed, they are performed again if requested. Raises if the changes are not accepted."""
+        if existing_metadata.method_fingerprints is None or existing_metadata.attribute_fingerprints is None:
+            changed_methods, changed_attributes = None, None  # stored before the fingerprints were introduced
+        else:
+            changed_methods = changed_fingerprints(existing_metadata.method_fingerprints, self.metadata.method_fingerprints)
+            changed_attributes = changed_fingerprints(existing_metadata.attribute_fingerprints,
+                                                      self.metadata.attribute_fingerprints)
+
+        if not changed_methods and not changed_attributes:
+            # e.g. the imports or constants of the config file, of which it is unknown which hooks use them
+            cont = output.query_yes_no("md5sum mismatch! This can occur if the configuration code "
+                                       "has changed since the last run. Continue anyway?", default=None)
+            if not cont:
+                raise BaseError("Aborting due to md5sum mismatch.")
+            return
+
+        output.console_log_WARNING(f"The config changed since the last run, changed hooks (and functions): "
+                                   f"{', '.join(changed_methods) or '-'}, changed attributes: "
+                                   f"{', '.join(changed_attributes) or '-'}")
+        stale_changes = [name for name in changed_methods if name not in OTHER_HOOKS] \
+                        + [name for name in changed_attributes if name not in RESULT_NEUTRAL_ATTRIBUTES]
+        stale_runs = [variation for variation in existing_run_table
+                      if variation['__done'] in [RunProgress.DONE, RunProgress.SKIPPED]]
+        if not stale_changes or not stale_runs:
+            return
+
+        cont = output.query_yes_no(f"The results of the {len(stale_runs)} completed run(s) may depend on: "
+                                   f"{', '.join(stale_changes)}. Perform them again? "
+                                   f"(n: keep their results)", default=None)
+        if not cont:
+            output.console_log_WARNING("Keeping the results of the completed runs")
+            return
+
+        stored_columns = self.run_table_model.get_data_columns() + self.run_table_model.get_runner_columns()
+        for variation in stale_runs:
+            variation['__done'] = RunProgress.TODO
+            variation.update({column: " " for column in stored_columns if column in variation})
+        self.csv_data_manager.write_run_table(existing_run_table)
+        output.console_log_WARNING(f"{len(stale_runs)} completed run(s) are performed again")
+
+    def __extend_run_table(self, existing_run_table: List[Dict]) -> List[Dict]:
+        """Stores the generated run table, in which the stored runs are matched by their treatments (and repetition)
+        instead of their id, keeping their results. Returns the stored run table, with the new runs after the stored
+        ones. The run folders and phase timings of stored runs whose id changed are renamed."""
+        dtypes = self.run_table_model.get_column_dtypes()
+        removed_columns = set(existing_run_table[0].keys()) - set(dtypes.keys())
+        if removed_columns:
+            raise BaseError(f"Cannot extend the experiment, the run table no longer defines the columns: "
+                            f"{', '.join(sorted(removed_columns))}")
+
+        key_columns = [factor.factor_name for factor in self.run_table_model.get_factors()]
+        if '__repetition' in dtypes:
+            key_columns.append('__repetition')
+        def key_of(variation: Dict) -> Tuple:
+            return tuple(dtypes[column](variation[column]) if column in variation else 1 for column in key_columns)
+        generated_runs = {key_of(variation): variation for variation in self.run_table}
+
+        extended_run_table, renamed_runs, removed_runs = [], {}, []
+        stored_columns = set(existing_run_table[0].keys()) - set(key_columns) - {'__run_id'}
+        for existing_var in existing_run_table:
+            generated_var = generated_runs.pop(key_of(existing_var), None)
+            if generated_var is None:
+                removed_runs.append(existing_var['__run_id'])
+                continue
+            for column in stored_columns:
+                generated_var[column] = existing_var[column]
+            if generated_var['__done'] == RunProgress.IN_PROGRESS:
+                generated_var['__done'] = RunProgress.TODO  # handed out by a coordinator that is no longer running
+            if existing_var['__run_id'] != generated_var['__run_id']:
+                renamed_runs[existing_var['__run_id']] = generated_var['__run_id']
+            extended_run_table.append(generated_var)
+        if removed_runs:
+            raise BaseError(f"Cannot extend the experiment, {len(removed_runs)} stored run(s) are no longer part of the "
+                            f"run table (e.g. {removed_runs[0]}), treatments can only be added")
+        extended_run_table.extend(generated_runs.values())
+
+        # Keep the stored run table, then move the run folders out of the way before giving them their new id
+        backup = self.config.experiment_path / f"run_table.csv.{datetime.datetime.now():%Y%m%d%H%M%S}.bak"
+        self.csv_data_manager.compact_run_table()
+        shutil.copyfile(self.config.experiment_path / 'run_table.csv', backup)
+        self.csv_data_manager.rename_runs_in_phase_timings(renamed_runs)
+        run_dirs = [(self.config.experiment_path / old_run_id, self.config.experiment_path / new_run_id)
+                    for old_run_id, new_run_id in renamed_runs.items()
+                    if (self.config.experiment_path / old_run_id).is_dir()]
+        for old_run_dir, new_run_dir in run_dirs:
+            old_run_dir.rename(old_run_dir.with_name(f"{old_run_dir.name}.extending"))
+        for old_run_dir, new_run_dir in run_dirs:
+            old_run_dir.with_name(f"{old_run_dir.name}.extending").rename(new_run_dir)
+
+        self.csv_data_manager.write_run_table(extended_run_table)
+        self.json_data_manager.write_metadata(self.metadata)  # the config was changed on purpose
+        output.console_log_WARNING(f"Extended the experiment with {len(generated_runs)} new run(s), keeping "
+                                   f"{len(existing_run_table)} stored run(s) ({len(renamed_runs)} got a new id). "
+                                   f"The stored run table was kept as: {backup.name}")
+        return self.csv_data_manager.read_run_table(dtypes)
+
+    def __start_session(self):
+        self.csv_data_manager.compact_run_table()
         output.console_log_OK("Experiment setup completed...")
+        self.__deadline = None
+        if self.config.time_budget_in_ms is not None:
+            self.__deadline = time.monotonic() + self.config.time_budget_in_ms / 1000
+        self.__out_of_budget_runs = []
+        self.__retry_round = 0
+        self.__failed_runs = []
+
+        # The durations of the runs completed in earlier invocations are known as well
+        self.__duration_model = RunDurationModel()
+        for timing in self.csv_data_manager.read_phase_timings():
+            variation = self.run_table.get(timing['__run_id'])
+            if timing['phase'] == 'TOTAL' and variation is not None and variation['__done'] == RunProgress.DONE:
+                self.__duration_model.add_duration(self.run_table_model.get_cell(variation), timing['duration_ms'] / 1000)
+
+        # The pending runs per cell are counted as their progress changes, instead of scanning the run table every run
+        self.__pending_runs = Counter(self.run_table_model.get_cell(variation) for variation in self.run_table
+                                      if variation['__done'] in self.PENDING_PROGRESS)
+
+    def do_experiment(self):
+        self.__start_session()
 
         # -- Before experiment
         # TODO: From a user perspective, it would be nice to know if this is a restarted experiment or not (in case something failed)
@@ -117,31 +320,633 @@ class ExperimentController:
         EventSubscriptionController.raise_event(RunnerEvents.BEFORE_EXPERIMENT)
 
         # -- Experiment
+        if self.__coordinator is not None:
+            # The runs are handed out one by one by the coordinator, which also decides on retries
+            self.__dispatch(self.__coordinator)
+        else:
+            if self.__stops_early():
+                self.__skip_converged_repetitions(self.run_table)
+            pending_runs = [variation for variation in self.run_table
+                            if variation['__done'] not in [RunProgress.DONE, RunProgress.SKIPPED]]
+            if self.__deadline is not None:
+                pending_runs = self.__interleave_cells(pending_runs)
+            while True:
+                self.__dispatch(self.__batch_runs(pending_runs))
+
+                # -- Retry the runs that failed, until the retry budget is spent
+                if not self.__failed_runs or self.__retry_round == self.config.run_retries:
+                    break
+                if self.__deadline is not None and time.monotonic() >= self.__deadline:
+                    break
+                self.__retry_round += 1
+                pending_runs = sorted(self.__failed_runs, key=self.run_table.index)
+                if self.__deadline is not None:
+                    pending_runs = self.__interleave_cells(pending_runs)
+                self.__failed_runs = []
+
+                backoff_ms = self.config.retry_backoff_in_ms * 2 ** (self.__retry_round - 1)
+                output.console_log_WARNING(f"Retrying {len(pending_runs)} failed run(s) (retry {self.__retry_round} / "
+                                           f"{self.config.run_retries}) in {backoff_ms}ms...")
+                time.sleep(backoff_ms / 1000)
+
+        if self.__out_of_budget_runs:
+            output.console_log_WARNING(f"The time budget did not allow for {len(self.__out_of_budget_runs)} run(s), "
+                                       f"they are performed when the experiment is restarted.")
+        failed_runs = [variation for variation in self.__failed_runs if variation['__done'] == RunProgress.FAILED]
+        if failed_runs and self.__coordinator is None:  # the coordinator reports the runs that failed
+            output.console_log_FAIL(f"{len(failed_runs)} run(s) failed: "
+                                    f"{', '.join(variation['__run_id'] for variation in failed_runs)}. "
+                                    f"They are performed again when the experiment is restarted.")
+        self.csv_data_manager.close()
+        output.console_log_OK("Experiment completed...")
+
+        # -- After experiment
+        output.console_log_WARNING("Calling after_experiment config hook")
+        EventSubscriptionController.raise_event(RunnerEvents.AFTER_EXPERIMENT)
+
+    def do_coordination(self, address: Tuple[str, int]):
+        """Hands out the pending runs one by one to the workers (`--worker`) that ask for them, and stores their results.
+        Runs handed out are IN_PROGRESS until their result is reported, which survives a restart of the coordinator."""
+        self.__start_session()
+        self.__handed_out_at: Dict[str, Tuple[float, float]] = {}   # run id -> (time.time(), time.perf_counter())
+        self.__worker_runs: Dict[str, Dict] = {}                  # worker -> last run handed out
+        self.__session_attempts: Dict[str, int] = {}
         for variation in self.run_table:
-            if variation['__done'] == RunProgress.DONE:
+            if variation['__done'] == RunProgress.IN_PROGRESS:
+                self.__handed_out_at[variation['__run_id']] = (time.time(), time.perf_counter())
+        if self.__stops_early():
+            self.__skip_converged_repetitions(self.run_table)
+
+        listener = Listener(address, authkey=self.metadata.md5sum)
+        output.console_log_OK(f"Coordinating the experiment on {address[0] or '*'}:{address[1]}, waiting for workers...")
+        completed = threading.Event()
+        self.__workers, self.__completed_workers = set(), set()
+
+        def serve():
+            while True:
+                try:
+                    connection = listener.accept()
+                except AuthenticationError:
+                    output.console_log_FAIL("Refused a worker that performs the experiment with a different config (md5sum)")
+                    continue
+                except OSError:
+                    return  # the listener is closed
+
+                with connection:
+                    try:
+                        request = connection.recv()
+                    except EOFError:
+                        continue
+                    try:
+                        with self.__run_table_lock:
+                            reply = self.__handle_worker_request(request)
+                    except Exception as e:
+                        # A faulty request must not stop the coordination of the other workers
+                        output.console_log_FAIL(f"Could not handle the request {request!r} of a worker: {e}")
+                        reply = ('error', f"{type(e).__name__}: {e}")
+                    if reply[0] == 'done':
+                        completed.set()
+                    connection.send(reply)
+
+        threading.Thread(target=serve, name="coordinator", daemon=True).start()
+        completed.wait()
+
+        # Let the workers that still wait for a run know that the experiment is completed
+        deadline = time.monotonic() + 2 * RunQueueClient.WAIT_INTERVAL_IN_S
+        while self.__workers - self.__completed_workers and time.monotonic() < deadline:
+            time.sleep(0.1)
+        listener.close()
+
+        failed_runs = [variation for variation in self.run_table if variation['__done'] == RunProgress.FAILED]
+        if failed_runs:
+            output.console_log_FAIL(f"{len(failed_runs)} run(s) failed: "
+                                    f"{', '.join(variation['__run_id'] for variation in failed_runs)}. "
+                                    f"They are performed again when the experiment is restarted.")
+        self.csv_data_manager.close()
+        output.console_log_OK("Experiment completed...")
+
+    def __handle_worker_request(self, request: Tuple) -> Tuple:
+        kind, worker = request[0], request[1]
+        self.__workers.add(worker)
+
+        if kind in ['result', 'release'] and self.run_table.get(request[2]) is None:
+            return ('error', f"Run {request[2]} is not part of the experiment")
+
+        if kind == 'result':
+            _, _, run_id, run_data, failure = request
+            self.__store_worker_result(worker, run_id, run_data, failure)
+            self.csv_data_manager.compact_run_table(self.JOURNAL_COMPACTION_SIZE)
+            return ('ok',)
+
+        if kind == 'release':
+            variation = self.run_table.get(request[2])
+            if variation['__done'] == RunProgress.IN_PROGRESS:
+                output.console_log_WARNING(f"Worker {worker} handed back run {variation['__run_id']}")
+                self.__handed_out_at.pop(variation['__run_id'], None)
+                self.__worker_runs.pop(worker, None)
+                # Runs handed out before a restart of the coordinator were not attempted in this session
+                run_id = variation['__run_id']
+                self.__session_attempts[run_id] = max(self.__session_attempts.get(run_id, 0) - 1, 0)
+                self.__set_progress(variation, RunProgress.TODO)
+                self.csv_data_manager.update_row_columns(variation['__run_id'], {'__done': RunProgress.TODO.name})
+            return ('ok',)
+
+        if kind != 'next':
+            return ('error', f"Unknown request {kind}")
+
+        # A worker only asks for its next run once it reported the result of its previous run
+        previous_variation = self.__worker_runs.get(worker)
+        if previous_variation is not None and previous_variation['__run_id'] in self.__handed_out_at:
+            self.__store_worker_result(worker, previous_variation['__run_id'], {}, f"worker {worker} lost the run")
+
+        variation = self.__next_run_for(worker)
+        if variation is not None:
+            run_id = variation['__run_id']
+            self.__session_attempts[run_id] = self.__session_attempts.get(run_id, 0) + 1
+            self.__handed_out_at[run_id] = (time.time(), time.perf_counter())
+            self.__worker_runs[worker] = variation
+            self.__set_progress(variation, RunProgress.IN_PROGRESS)
+            updated_columns = {'__done': RunProgress.IN_PROGRESS.name}
+            if self.config.run_retries > 0:
+                variation['__attempts'] = int(variation['__attempts']) + 1 if str(variation['__attempts']).strip() else 1
+                updated_columns['__attempts'] = variation['__attempts']
+            self.csv_data_manager.update_row_columns(run_id, updated_columns)
+            output.console_log_OK(f"Handed out run {run_id} to worker {worker}")
+            return ('run', run_id)
+
+        if self.__handed_out_at:
+            return ('wait', RunQueueClient.WAIT_INTERVAL_IN_S)
+        self.__completed_workers.add(worker)
+        return ('done',)
+
+    def __next_run_for(self, worker: str) -> Optional[Dict]:
+        def may_be_performed(variation: Dict) -> bool:
+            if variation['__done'] == RunProgress.TODO:
+                return True
+            return variation['__done'] == RunProgress.FAILED \
+                and self.__session_attempts.get(variation['__run_id'], 0) <= self.config.run_retries
+
+        # Failed runs are retried after all other runs
+        pending_runs = [variation for variation in self.run_table if variation['__done'] == RunProgress.TODO] \
+                       + [variation for variation in self.run_table if variation['__done'] == RunProgress.FAILED]
+        pending_runs = [variation for variation in pending_runs if may_be_performed(variation)]
+
+        # A run whose result is overdue (3 times the longest duration of its treatments) is considered lost
+        if not pending_runs:
+            for run_id, (_, handed_out_at) in list(self.__handed_out_at.items()):
+                variation = self.run_table.get(run_id)
+                longest_duration = self.__duration_model.longest_duration(self.run_table_model.get_cell(variation))
+                if longest_duration is not None and time.perf_counter() - handed_out_at > 3 * longest_duration:
+                    self.__store_worker_result(None, run_id, {}, "the result of the run is overdue")
+                    if may_be_performed(variation):
+                        pending_runs.append(variation)
+        if not pending_runs:
+            return None
+
+        # Prefer the next run of the group of the worker's previous run, which shares its deployment
+        previous_variation = self.__worker_runs.get(worker)
+        if self.config.group_factors and previous_variation is not None:
+            for variation in pending_runs:
+                if self.__group_of(variation) == self.__group_of(previous_variation):
+                    return variation
+        return pending_runs[0]
+
+    def __store_worker_result(self, worker: Optional[str], run_id: str, run_data: Dict, failure: Optional[str]):
+        variation = self.run_table.get(run_id)
+        if variation['__done'] in [RunProgress.DONE, RunProgress.SKIPPED]:
+            return  # the run was handed out again, and another worker already performed it
+        if worker is not None and self.__worker_runs.get(worker) is variation:
+            del self.__worker_runs[worker]
+        handed_out_at = self.__handed_out_at.pop(run_id, None)
+
+        if failure is not None:
+            self.__fail_run(variation, failure, retried=self.__session_attempts.get(run_id, 0) <= self.config.run_retries)
+            return
+
+        if self.config.run_retries > 0:
+            run_data = {**run_data, '__attempts': variation['__attempts'], '__failure': " "}  # without an earlier failure
+        variation.update(run_data)
+        self.__set_progress(variation, RunProgress.DONE)
+        self.csv_data_manager.update_row_columns(run_id, {**run_data, '__done': RunProgress.DONE.name})
+        if handed_out_at is not None:
+            run_duration_ms = (time.perf_counter() - handed_out_at[1]) * 1000
+            self.__duration_model.add_duration(self.run_table_model.get_cell(variation), run_duration_ms / 1000)
+            self.csv_data_manager.append_phase_timings(run_id, [('TOTAL', handed_out_at[0], run_duration_ms)])
+        output.console_log_OK(f"Run {run_id} completed by worker {worker}")
+
+        if self.__stops_early():
+            cell = self.run_table_model.get_cell(variation)
+            self.__skip_converged_repetitions(self.run_table.runs_of_cell(cell))
+
+    def __dispatch(self, pending_runs: queue.Queue):
+        if len(self.config.hosts) > 1:
+            self.__dispatch_to_host_pool(pending_runs)
+        else:
+            self.__run_worker(pending_runs, self.config.hosts[0] if self.config.hosts else None)
+
+    def __dispatch_to_host_pool(self, pending_runs: queue.Queue):
+        output.console_log_WARNING(f"Dispatching runs over the host pool: {', '.join(self.config.hosts)}")
+
+        # Every host gets its own worker, which takes the next pending run (or group of runs) as soon as its host is free
+        errors = []
+        def host_worker(host: str):
+            try:
+                self.__run_worker(pending_runs, host)
+            except Exception as e:
+                output.console_log_FAIL(f"Worker for host {host} stopped: {e}")
+                errors.append(e)
+
+        workers = [threading.Thread(target=host_worker, args=[host], name=f"host-{host}") for host in self.config.hosts]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if errors:
+            raise errors[0]
+
+    def __batch_runs(self, variations: List[Dict]) -> queue.Queue:
+        # Consecutive runs of the same group are dispatched together, so that they share the group's deployment
+        pending_runs = queue.Queue()
+        batch = []
+        for variation in variations:
+            if batch and (not self.config.group_factors or self.__group_of(batch[-1]) != self.__group_of(variation)):
+                pending_runs.put(batch)
+                batch = []
+            batch.append(variation)
+        if batch:
+            pending_runs.put(batch)
+        return pending_runs
+
+    def __group_of(self, variation: Dict) -> Tuple:
+        return tuple(str(variation[factor_name]) for factor_name in self.config.group_factors)
+
+    def __run_context(self, variation: Dict, host: Optional[str]) -> RunnerContext:
+        run_dir = self.config.experiment_path / variation['__run_id']
+        run_dir.mkdir(parents=True, exist_ok=True)
+        return RunnerContext(variation, self.run_table.index(variation) + 1, run_dir, host)
+
+    def __run_worker(self, pending_runs: queue.Queue, host: Optional[str]):
+        run_worker = RunWorker(self.config) if self.config.persistent_run_worker else None
+        last_variation = None
+        try:
+            while True:
+                try:
+                    batch: List[Dict] = pending_runs.get_nowait()
+                except queue.Empty:
+                    break
+
+                for variation in batch:
+                    if not self.__fits_in_time_budget(variation):
+                        self.__out_of_budget_runs.append(variation)
+                        if self.__coordinator is not None:
+                            self.__coordinator.release(variation)
+                        continue
+                    if not self.__claim_run(variation):
+                        continue
+                    if self.__result_cache is not None and self.__take_cached_result(variation, host):
+                        self.__release_run(variation, succeeded=True)
+                        if self.__coordinator is not None:
+                            self.__report_run(variation, None)
+                        continue
+
+                    continues_group = bool(self.config.group_factors) and last_variation is not None \
+                                      and self.__group_of(last_variation) == self.__group_of(variation)
+                    if self.config.group_factors and not continues_group:
+                        if last_variation is not None:
+                            output.console_log_WARNING("Calling after_group config hook")
+                            EventSubscriptionController.raise_event(RunnerEvents.AFTER_GROUP, self.__run_context(last_variation, host))
+                        output.console_log_WARNING("Calling before_group config hook")
+                        EventSubscriptionController.raise_event(RunnerEvents.BEFORE_GROUP, self.__run_context(variation, host))
+                        if run_worker:
+                            run_worker.stop()  # restarted for the next run, inheriting the state set by before_group
+
+                    run_started_at, run_start = time.time(), time.perf_counter()
+                    failure = self.__perform_run(variation, host, run_worker, continues_group)
+                    if failure is not None:
+                        self.__fail_run(variation, failure, retried=self.__retry_round < self.config.run_retries)
+                    else:
+                        run_duration_ms = (time.perf_counter() - run_start) * 1000
+                        self.__duration_model.add_duration(self.run_table_model.get_cell(variation), run_duration_ms / 1000)
+                        self.csv_data_manager.append_phase_timings(variation['__run_id'], [('TOTAL', run_started_at, run_duration_ms)])
+                        if self.__result_cache is not None:
+                            self.__cache_result(variation, host)
+                    self.__release_run(variation, succeeded=failure is None)
+                    if self.__coordinator is not None:
+                        self.__report_run(variation, failure)
+                    self.csv_data_manager.compact_run_table(self.JOURNAL_COMPACTION_SIZE)
+                    last_variation = variation
+
+            if self.config.group_factors and last_variation is not None:
+                output.console_log_WARNING("Calling after_group config hook")
+                EventSubscriptionController.raise_event(RunnerEvents.AFTER_GROUP, self.__run_context(last_variation, host))
+        finally:
+            if run_worker:
+                run_worker.stop()
+
+    def __interleave_cells(self, variations: List[Dict]) -> List[Dict]:
+        # Round robin over the treatment combinations, every round in the order of the run table. Only within blocks of
+        # consecutive runs of the same group without transition costs between them, the blocks keep their order
+        blocks: List[List[Dict]] = []
+        for variation in variations:
+            if not blocks \
+                    or (self.config.group_factors and self.__group_of(blocks[-1][-1]) != self.__group_of(variation)) \
+                    or self.run_table_model.get_transition_cost(blocks[-1][-1], variation) > 0:
+                blocks.append([])
+            blocks[-1].append(variation)
+
+        interleaved_runs = []
+        for block in blocks:
+            cells: Dict[Tuple, List[Dict]] = {}
+            for variation in block:
+                cells.setdefault(self.run_table_model.get_cell(variation), []).append(variation)
+            interleaved_runs.extend(variation for cell_round in itertools.zip_longest(*cells.values())
+                                    for variation in cell_round if variation is not None)
+        return interleaved_runs
+
+    def __fits_in_time_budget(self, variation: Dict) -> bool:
+        if self.__deadline is None:
+            return True
+
+        # Conservatively expect the longest duration (incl. cooldown) of the runs with the same treatments, or any run
+        duration = self.__duration_model.longest_duration(self.run_table_model.get_cell(variation)) or 0
+        remaining = self.__deadline - time.monotonic()
+        if duration > remaining:
+            if not self.__out_of_budget_runs:
+                output.console_log_WARNING(f"Not starting run {variation['__run_id']} (nor any next run that does not fit), "
+                                           f"it is expected to take {duration:.1f}s while {max(remaining, 0):.1f}s "
+                                           f"of the time budget is left")
+            return False
+        return True
+
+    def __report_run(self, variation: Dict, failure: Optional[str]):
+        # The run data is stored by the run itself, pass it on to the coordinator
+        run_data = {}
+        if failure is None:
+            stored_variation = self.__stored_run(variation)
+            run_data = {column: stored_variation[column] for column in self.run_table_model.get_data_columns()
+                        + self.run_table_model.get_runner_columns() if column not in ['__attempts', '__failure']}
+        self.__coordinator.report(variation, run_data, failure)
+
+    def __set_progress(self, variation: Dict, progress: RunProgress):
+        # Only the count of a cell whose pending runs changed is written, as runs on different hosts fail concurrently
+        change = (progress in self.PENDING_PROGRESS) - (variation['__done'] in self.PENDING_PROGRESS)
+        if change:
+            self.__pending_runs[self.run_table_model.get_cell(variation)] += change
+        variation['__done'] = progress
+
+    def __stored_run(self, variation: Dict) -> Dict:
+        # The run data is stored by the run itself (in another process), only its updates are read back
+        return {**variation, **self.csv_data_manager.read_row_updates(variation['__run_id'])}
+
+    def __system_under_test(self, host: Optional[str]) -> str:
+        return self.config.system_under_test or host or socket.gethostname()
+
+    def __take_cached_result(self, variation: Dict, host: Optional[str]) -> bool:
+        """Takes the run data from the result cache instead of performing the run, if a result was cached for it."""
+        result = self.__result_cache.lookup(variation, self.__system_under_test(host))
+        if result is None:
+            return False
+
+        run_data = {column: value for column, value in result['run_data'].items()
+                    if column in self.run_table_model.get_data_columns()}
+        output.console_log_OK(f"Run {variation['__run_id']} is not performed, its result is taken from the cache "
+                              f"(measured in {result['source']})")
+        if self.config.run_retries > 0:
+            run_data['__failure'] = " "  # of an earlier attempt to perform the run
+        variation.update(run_data)
+        variation['__cached_from'] = result['source']
+        self.csv_data_manager.update_row_columns(variation['__run_id'], {**run_data, '__cached_from': result['source'],
+                                                                         '__done': RunProgress.DONE.name})
+        return True
+
+    def __cache_result(self, variation: Dict, host: Optional[str]):
+        # The run data is stored by the run itself
+        stored_variation = self.__stored_run(variation)
+        run_data = {column: stored_variation[column] for column in self.run_table_model.get_data_columns()}
+        self.__result_cache.store(variation, self.__system_under_test(host), run_data,
+                                  str(self.config.experiment_path / variation['__run_id']))
+
+    def __stops_early(self) -> bool:
+        # The coordinator decides on the repetitions of the runs it hands out to workers
+        if self.__coordinator is not None:
+            return False
+        repetitions = self.run_table_model.get_repetitions()
+        return repetitions is not None and repetitions.stops_early()
+
+    def __claim_run(self, variation: Dict) -> bool:
+        """Whether the run should still be performed, if so it cannot be skipped anymore until it is released."""
+        with self.__run_table_lock:
+            if variation['__done'] == RunProgress.SKIPPED:
+                output.console_log_WARNING(f"Skipping run {variation['__run_id']}, the repetitions of its cell converged")
+                return False
+            self.__runs_in_progress.add(variation['__run_id'])
+            return True
+
+    def __release_run(self, variation: Dict, succeeded: bool):
+        with self.__run_table_lock:
+            self.__runs_in_progress.discard(variation['__run_id'])
+            if not succeeded:
+                return
+            self.__set_progress(variation, RunProgress.DONE)
+            if not self.__stops_early():
+                return
+
+            # The run data is stored by the run itself, take it over to evaluate the stopping rule of its cell
+            data_column = self.run_table_model.get_repetitions().data_column
+            variation[data_column] = self.__stored_run(variation)[data_column]
+
+            cell = self.run_table_model.get_cell(variation)
+            self.__skip_converged_repetitions(self.run_table.runs_of_cell(cell))
+
+    def __skip_converged_repetitions(self, variations: List[Dict]):
+        """Marks the remaining repetitions of the cells (of the given runs) whose results converged as SKIPPED."""
+        repetitions = self.run_table_model.get_repetitions()
+        cells: Dict[Tuple, List[Dict]] = {}
+        for variation in variations:
+            cells.setdefault(self.run_table_model.get_cell(variation), []).append(variation)
+
+        for cell, cell_runs in cells.items():
+            values = []
+            for variation in cell_runs:
+                if variation['__done'] != RunProgress.DONE:
+                    continue
+                try:
+                    values.append(float(variation[repetitions.data_column]))
+                except (TypeError, ValueError):
+                    pass
+
+            if not repetitions.has_converged(values):
                 continue
 
+            skipped_runs = [variation for variation in cell_runs
+                            if variation['__done'] in [RunProgress.TODO, RunProgress.FAILED]
+                            and variation['__run_id'] not in self.__runs_in_progress]
+            if skipped_runs:
+                output.console_log_OK(f"Repetitions of {', '.join(cell)} converged after {len(values)} runs, "
+                                      f"skipping {len(skipped_runs)} remaining run(s)")
+            for variation in skipped_runs:
+                self.__set_progress(variation, RunProgress.SKIPPED)
+                self.csv_data_manager.update_row_columns(variation['__run_id'], {'__done': RunProgress.SKIPPED.name})
+
+    def __perform_run(self, variation: Dict, host: Optional[str], run_worker: Optional[RunWorker], continues_group: bool) -> Optional[str]:
+        """Performs the run and returns the reason it failed, if it failed."""
+        if self.config.run_retries > 0:
+            variation['__attempts'] = int(variation['__attempts']) + 1 if str(variation['__attempts']).strip() else 1
+            variation['__failure'] = " "  # the run stores its attempts along with its data, without an earlier failure
+
+        current_run, total_runs = (self.run_table.index(variation) + 1), len(self.run_table)
+        time_left_in_s = self.__duration_model.expected_time_left(self.__pending_runs,
+                                                                  parallelism=max(len(self.config.hosts), 1))
+        if run_worker:
+            # before_run is called in the run worker, so that the state it sets on the config is available to the run
+            run_worker.submit(variation, current_run, total_runs, host, continues_group, time_left_in_s)
+            run = run_worker
+            run_in_progress, wait_for_run, kill_run = run_worker.is_run_in_progress, run_worker.wait_for_run, run_worker.kill
+            get_run_error = lambda: run_worker.run_error
+        else:
             output.console_log_WARNING("Calling before_run config hook")
+            before_run_started_at, before_run_start = time.time(), time.perf_counter()
             EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+            self.csv_data_manager.append_phase_timings(variation['__run_id'], [(RunnerEvents.BEFORE_RUN.name, before_run_started_at,
+                                                                               (time.perf_counter() - before_run_start) * 1000)])
+
+            run_controller = RunController(variation, self.config, current_run, total_runs, host, continues_group, time_left_in_s)
+            run_errors, report_run_error = multiprocessing.Pipe(duplex=False)
+            def do_run():
+                try:
+                    run_controller.do_run()
+                except Exception as e:
+                    message = str(e).splitlines()[0].replace(" (in subprocess)", "") if str(e) else ""
+                    report_run_error.send(f"{type(e).__name__}: {message}")
+                    raise
 
-            run_controller = RunController(variation, self.config, (self.run_table.index(variation) + 1), len(self.run_table))
             perform_run = multiprocessing.Process(
-                target=run_controller.do_run,
+                target=do_run,
                 args=[]
             )
             perform_run.start()
-            perform_run.join()
+            report_run_error.close()
+            run = run_controller
+            run_in_progress, wait_for_run = perform_run.is_alive, perform_run.join
+            def kill_run():
+                kill_process_tree(perform_run.pid)
+                perform_run.join()
+            def get_run_error():
+                try:
+                    return run_errors.recv()
+                except EOFError:
+                    pass
+                return f"run process exited with code {perform_run.exitcode}" if perform_run.exitcode else None
 
-            time_btwn_runs = self.config.time_between_runs_in_ms
-            if time_btwn_runs > 0:
-                output.console_log_bold(f"Run fully ended, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s. [{datetime.datetime.now()}]")
-                time.sleep(time_btwn_runs / 1000)
+        failure = None
+        timed_out_phase = self.__supervise_run(run, run_in_progress, wait_for_run,
+                                               until_run_completed=self.config.populate_during_cooldown)
+        if timed_out_phase:
+            self.__stop_timed_out_run(variation, host, timed_out_phase, kill_run)
+            failure = f"{timed_out_phase.name} exceeded its timeout"
 
-            if self.config.operation_type is OperationType.SEMI:
-                EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
+        host_info = f" on {host}" if host else ""
+        time_btwn_runs = self.config.time_between_runs_in_ms
+        cooldown_ms = None
+        cooldown_started_at, cooldown_start = time.time(), time.perf_counter()
+        if self.config.cooldown_policy is not None:
+            output.console_log_bold(f"Run fully ended{host_info}, cooling down for at most: {time_btwn_runs}ms. [{datetime.datetime.now()}]")
+            cooldown_ms = self.__cooldown_policies.get(host, self.config.cooldown_policy).wait(time_btwn_runs)
+            output.console_log_bold(f"Cooled down{host_info} after: {cooldown_ms}ms == {cooldown_ms / 1000}s.")
+        elif time_btwn_runs > 0:
+            output.console_log_bold(f"Run fully ended{host_info}, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s. [{datetime.datetime.now()}]")
+            time.sleep(time_btwn_runs / 1000)
+        self.csv_data_manager.append_phase_timings(variation['__run_id'], [('COOLDOWN', cooldown_started_at,
+                                                                           (time.perf_counter() - cooldown_start) * 1000)])
 
-        output.console_log_OK("Experiment completed...")
+        if run_in_progress():
+            output.console_log_WARNING("Cooldown ended, waiting for the run data to be collected...")
+        timed_out_phase = self.__supervise_run(run, run_in_progress, wait_for_run, until_run_completed=False)
+        if timed_out_phase:
+            self.__stop_timed_out_run(variation, host, timed_out_phase, kill_run)
+            failure = f"{timed_out_phase.name} exceeded its timeout"
+        elif failure is None:
+            run_error = get_run_error()
+            if run_error is not None:
+                failure = run_error.strip().splitlines()[-1]
 
-        # -- After experiment
-        output.console_log_WARNING("Calling after_experiment config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.AFTER_EXPERIMENT)
+        if cooldown_ms is not None:
+            variation['__cooldown_ms'] = cooldown_ms
+            self.csv_data_manager.update_row_columns(variation['__run_id'], {'__cooldown_ms': cooldown_ms})
+
+        if self.config.operation_type is OperationType.SEMI:
+            EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
+
+        return failure
+
+    def __supervise_run(self, run, run_in_progress: Callable, wait_for_run: Callable, until_run_completed: bool) -> Optional[RunnerEvents]:
+        """Waits until the run ended, or only until the run completed (i.e. before its data is collected).
+        Returns the phase of the run that exceeded its timeout, if any."""
+        if not self.config.phase_timeouts_in_ms:
+            if until_run_completed:
+                while not run.run_completed_event.wait(timeout=1) and run_in_progress():
+                    pass
+            else:
+                wait_for_run()
+            return None
+
+        while run_in_progress():
+            if until_run_completed:
+                if run.run_completed_event.wait(timeout=1):
+                    return None
+            else:
+                wait_for_run(1)
+
+            phase = next((event for event in self.config.phase_timeouts_in_ms if event.value == run.current_phase.value), None)
+            if phase and (time.time() - run.phase_started_at.value) * 1000 > self.config.phase_timeouts_in_ms[phase]:
+                return phase
+
+        if not until_run_completed:
+            wait_for_run()
+        return None
+
+    def __stop_timed_out_run(self, variation: Dict, host: Optional[str], phase: RunnerEvents, kill_run: Callable):
+        output.console_log_FAIL(f"{phase.name} of run {variation['__run_id']} exceeded its timeout of "
+                                f"{self.config.phase_timeouts_in_ms[phase]}ms, killing the run...")
+        kill_run()
+
+        # Clean up in a fresh context, unless the run was already stopped
+        if phase is not RunnerEvents.POPULATE_RUN_DATA:
+            context = self.__run_context(variation, host)
+            def teardown():
+                for event in [RunnerEvents.STOP_MEASUREMENT, RunnerEvents.STOP_RUN]:
+                    try:
+                        EventSubscriptionController.raise_event(event, context)
+                    except Exception as e:
+                        output.console_log_FAIL(f"Teardown of run {variation['__run_id']} failed during {event.name}: {e}")
+
+            output.console_log_WARNING("Calling stop_measurement and stop_run config hooks to clean up")
+            teardown_timeouts = [self.config.phase_timeouts_in_ms.get(event) for event in [RunnerEvents.STOP_MEASUREMENT, RunnerEvents.STOP_RUN]]
+            perform_teardown = multiprocessing.Process(target=teardown)
+            perform_teardown.start()
+            perform_teardown.join(None if None in teardown_timeouts else sum(teardown_timeouts) / 1000)
+            if perform_teardown.is_alive():
+                output.console_log_FAIL(f"Teardown of run {variation['__run_id']} exceeded its timeout, killing it...")
+                kill_process_tree(perform_teardown.pid)
+                perform_teardown.join()
+
+    def __fail_run(self, variation: Dict, failure: str, retried: bool):
+        self.__set_progress(variation, RunProgress.FAILED)
+        updated_columns = {}
+        if self.config.run_retries > 0:
+            updated_columns.update({'__attempts': variation['__attempts'], '__failure': failure})
+
+        if self.__coordinator is not None:
+            output.console_log_FAIL(f"Run {variation['__run_id']} failed ({failure}), it is reported to the coordinator")
+        elif retried:
+            output.console_log_FAIL(f"Run {variation['__run_id']} failed ({failure}), it is retried later")
+        elif self.config.run_retries > 0:
+            output.console_log_FAIL(f"Run {variation['__run_id']} failed ({failure}), its retries are spent")
+        else:
+            output.console_log_FAIL(f"Run {variation['__run_id']} failed ({failure})")
+
+        variation.update(updated_columns)
+        if variation not in self.__failed_runs:
+            self.__failed_runs.append(variation)
+        self.csv_data_manager.update_row_columns(variation['__run_id'], {**updated_columns, '__done': RunProgress.FAILED.name})
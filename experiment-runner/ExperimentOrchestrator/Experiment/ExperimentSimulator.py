@@ -0,0 +1,199 @@
+import datetime
+import statistics
+from typing import Callable, Dict, List, Optional, Tuple
+from tabulate import tabulate
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+###     =========================================================
+###     |                                                       |
+###     |                  ExperimentSimulator                  |
+###     |       - Walk the pending runs through all events      |
+###     |         on a virtual clock, without calling hooks     |
+###     |       - Hook durations from earlier phase timings     |
+###     |         or from the user's estimates                  |
+###     |       - Report wall time, host utilisation and        |
+###     |         transition cost                               |
+###     |                                                       |
+###     =========================================================
+class ExperimentSimulator:
+
+    def __init__(self, config: RunnerConfig, all_runs: bool = False):
+        """Simulates the pending runs of the experiment, or all its runs if `all_runs` is set (e.g. to compare the
+        configured dispatching with the one of a completed experiment)."""
+        self.config = config
+        self.all_runs = all_runs
+        self.run_table_model = self.config.create_run_table_model()
+        self.run_table = self.run_table_model.generate_experiment_run_table()
+
+        # Only the pending runs of an experiment that was already started are simulated. The runs are matched on their
+        # treatments (and repetition), as their ids differ from the stored ones if the design changed since
+        csv_data_manager = CSVOutputManager(self.config.experiment_path)
+        stored_run_table = []
+        if (self.config.experiment_path / 'run_table.csv').exists():
+            stored_run_table = csv_data_manager.read_run_table(self.run_table_model.get_column_dtypes())
+        if not self.all_runs:
+            finished_runs = set(self.__run_key(variation) for variation in stored_run_table
+                                if variation['__done'] in [RunProgress.DONE, RunProgress.SKIPPED])
+            finished_runs.discard(None)
+            self.run_table = [variation for variation in self.run_table if self.__run_key(variation) not in finished_runs]
+
+        # The average recorded durations per (treatment combination, phase), and per phase. The timings were recorded
+        # under the run ids of the stored run table, which differ from the current ones if the design changed since
+        cells: Dict[str, Tuple] = {}
+        for variation in stored_run_table:
+            cell = self.__stored_cell(variation)
+            if cell is not None:
+                cells[variation['__run_id']] = cell
+        recorded_durations: Dict[Tuple, List[float]] = {}
+        for timing in csv_data_manager.read_phase_timings():
+            cell = cells.get(timing['__run_id'])
+            if cell is not None:
+                recorded_durations.setdefault((cell, timing['phase']), []).append(timing['duration_ms'] / 1000)
+                recorded_durations.setdefault((None, timing['phase']), []).append(timing['duration_ms'] / 1000)
+        self.__recorded_durations = {key: statistics.mean(durations) for key, durations in recorded_durations.items()}
+        self.__unknown_phases = set()
+
+    def __stored_cell(self, variation: Dict) -> Optional[Tuple]:
+        # The stored run table lacks the factors that were added to the config since
+        try:
+            return self.run_table_model.get_cell(variation)
+        except KeyError:
+            return None
+
+    def __run_key(self, variation: Dict) -> Optional[Tuple]:
+        cell = self.__stored_cell(variation)
+        return (cell, int(variation.get('__repetition', 1))) if cell is not None else None
+
+    def __duration(self, phase: str, variation: Optional[Dict]) -> float:
+        """The expected duration (in s) of a phase, as recorded for the same treatments, for any run, or as estimated."""
+        cell = self.run_table_model.get_cell(variation) if variation is not None else None
+        duration = self.__recorded_durations.get((cell, phase), self.__recorded_durations.get((None, phase)))
+        if duration is None:
+            if phase == 'COOLDOWN':
+                cooldown_policy = self.config.cooldown_policy
+                duration = (cooldown_policy.max_cooldown_in_ms if cooldown_policy and cooldown_policy.max_cooldown_in_ms is not None
+                            else self.config.time_between_runs_in_ms) / 1000
+            elif RunnerEvents[phase] in self.config.simulated_phase_durations_in_ms:
+                duration = self.config.simulated_phase_durations_in_ms[RunnerEvents[phase]] / 1000
+            else:
+                self.__unknown_phases.add(phase)
+                duration = 0
+
+        # A hook exceeding its timeout is killed
+        if phase != 'COOLDOWN' and RunnerEvents[phase] in self.config.phase_timeouts_in_ms:
+            duration = min(duration, self.config.phase_timeouts_in_ms[RunnerEvents[phase]] / 1000)
+        return duration
+
+    def __group_of(self, variation: Dict) -> Tuple:
+        return tuple(str(variation[factor_name]) for factor_name in self.config.group_factors)
+
+    def simulate(self):
+        output.console_log_WARNING(f"Simulating {len(self.run_table)} {'' if self.all_runs else 'pending '}run(s) "
+                                   f"on a virtual clock, no hooks are called")
+
+        # Consecutive runs of the same group are dispatched together, as when performing the experiment
+        batches = []
+        for variation in self.run_table:
+            if batches and self.config.group_factors and self.__group_of(batches[-1][-1]) == self.__group_of(variation):
+                batches[-1].append(variation)
+            else:
+                batches.append([variation])
+
+        hosts = self.config.hosts or [None]
+        phase_totals: Dict[str, float] = {}
+        def spend(phase: str, variation: Optional[Dict]) -> float:
+            duration = self.__duration(phase, variation)
+            phase_totals[phase] = phase_totals.get(phase, 0) + duration
+            return duration
+
+        clock = spend(RunnerEvents.BEFORE_EXPERIMENT.name, None)
+        host_clocks = {host: clock for host in hosts}
+        host_busy = {host: 0.0 for host in hosts}
+        host_runs = {host: 0 for host in hosts}
+        host_costs = {host: 0.0 for host in hosts}
+        last_variations: Dict[Optional[str], Optional[Dict]] = {host: None for host in hosts}
+        out_of_budget_runs = 0
+
+        for batch in batches:
+            host = min(hosts, key=lambda h: host_clocks[h])  # the host that is free first takes the next batch
+            for variation in batch:
+                last_variation = last_variations[host]
+                continues_group = bool(self.config.group_factors) and last_variation is not None \
+                                  and self.__group_of(last_variation) == self.__group_of(variation)
+
+                phases = []
+                if self.config.group_factors and not continues_group:
+                    if last_variation is not None:
+                        phases.append((RunnerEvents.AFTER_GROUP.name, last_variation))
+                    phases.append((RunnerEvents.BEFORE_GROUP.name, variation))
+                phases.append((RunnerEvents.BEFORE_RUN.name, variation))
+                if continues_group:
+                    phases.append((RunnerEvents.RESET_RUN.name, variation))
+                phases.extend((event.name, variation) for event in [RunnerEvents.START_RUN, RunnerEvents.START_MEASUREMENT,
+                                                                   RunnerEvents.INTERACT, RunnerEvents.STOP_MEASUREMENT,
+                                                                   RunnerEvents.STOP_RUN])
+
+                expected_duration = sum(self.__duration(phase, v) for phase, v in phases) \
+                                    + self.__populate_and_cooldown(variation, self.__duration)
+                if self.config.time_budget_in_ms is not None and \
+                        host_clocks[host] + expected_duration > self.config.time_budget_in_ms / 1000:
+                    out_of_budget_runs += 1
+                    continue
+
+                run_duration = sum(spend(phase, v) for phase, v in phases) \
+                               + self.__populate_and_cooldown(variation, spend)
+                host_clocks[host] += run_duration
+                host_busy[host] += run_duration
+                host_runs[host] += 1
+                if last_variation is not None:
+                    host_costs[host] += self.run_table_model.get_transition_cost(last_variation, variation)
+                last_variations[host] = variation
+
+        for host in hosts:
+            if self.config.group_factors and last_variations[host] is not None:
+                host_clocks[host] += spend(RunnerEvents.AFTER_GROUP.name, last_variations[host])
+        wall_time = max(host_clocks.values()) + spend(RunnerEvents.AFTER_EXPERIMENT.name, None)
+
+        self.__report(wall_time, hosts, host_runs, host_busy, host_costs, phase_totals, out_of_budget_runs)
+
+    def __populate_and_cooldown(self, variation: Dict, spend: Callable[[str, Dict], float]) -> float:
+        populate = spend(RunnerEvents.POPULATE_RUN_DATA.name, variation)
+        cooldown = spend('COOLDOWN', variation)
+        # With populate_during_cooldown, the run data is collected while cooling down
+        return max(populate, cooldown) if self.config.populate_during_cooldown else populate + cooldown
+
+    def __report(self, wall_time: float, hosts: List[Optional[str]], host_runs: Dict, host_busy: Dict, host_costs: Dict,
+                 phase_totals: Dict[str, float], out_of_budget_runs: int):
+        def format_duration(seconds: float) -> str:
+            return str(datetime.timedelta(seconds=round(seconds)))
+
+        print()
+        print(tabulate([(host or "(local)", host_runs[host], format_duration(host_busy[host]),
+                         f"{100 * host_busy[host] / wall_time:.1f}%" if wall_time else "-", f"{host_costs[host]:g}")
+                        for host in hosts],
+                       ["Host", "Runs", "Busy", "Utilisation", "Transition cost"]))
+        print()
+        total = sum(phase_totals.values())
+        print(tabulate([(phase, format_duration(duration), f"{100 * duration / total:.1f}%" if total else "-")
+                        for phase, duration in phase_totals.items()],
+                       ["Phase", "Time", "Share"]))
+        print()
+
+        if self.__unknown_phases:
+            output.console_log_WARNING(f"No timings or estimates (`simulated_phase_durations_in_ms`) for: "
+                                       f"{', '.join(sorted(self.__unknown_phases))}, they are assumed to take no time")
+        repetitions = self.run_table_model.get_repetitions()
+        if repetitions is not None and repetitions.stops_early():
+            output.console_log_WARNING("All repetitions are simulated, stopping early can only make the experiment shorter")
+        if out_of_budget_runs:
+            output.console_log_WARNING(f"{out_of_budget_runs} run(s) do not fit in the time budget")
+
+        finished_at = datetime.datetime.now() + datetime.timedelta(seconds=wall_time)
+        output.console_log_OK(f"Expected wall time: {format_duration(wall_time)} (finished at {finished_at:%Y-%m-%d %H:%M}), "
+                              f"transition cost: {sum(host_costs.values()):g}")
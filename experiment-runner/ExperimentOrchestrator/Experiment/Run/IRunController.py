@@ -1,9 +1,10 @@
-from typing import Dict
+import datetime
+from typing import Dict, Optional
 
 from ProgressManager.Output.CSVOutputManager import CSVOutputManager
 from pathlib import Path
 from abc import ABC, abstractmethod
-from multiprocessing import Event
+from multiprocessing import Event, Value
 
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
@@ -13,22 +14,34 @@ class IRunController(ABC):
     current_run: int = None
     variation: Dict = None
     config: RunnerConfig = None
+    host: Optional[str] = None
+    continues_group: bool = False
     run_context: RunnerContext = None
     data_manager: CSVOutputManager = None
 
-    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int):
+    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int, host: Optional[str] = None,
+                 continues_group: bool = False, time_left_in_s: Optional[float] = None):
         self.run_dir = config.experiment_path / variation['__run_id']
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
         self.variation = variation
         self.config = config
         self.current_run = current_run
-        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir)
+        self.host = host
+        self.continues_group = continues_group
+        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir, self.host)
         self.data_manager = CSVOutputManager(self.config.experiment_path)
 
         self.run_completed_event = Event()
-
-        print(f"\n-----------------NEW RUN [{current_run} / {total_runs}]-----------------\n")
+        self.current_phase = Value('i', 0)          # RunnerEvents value of the hook being called, for the watchdog
+        self.phase_started_at = Value('d', 0.0)
+
+        host_info = f" @ {host}" if host else ""
+        eta_info = ""
+        if time_left_in_s is not None:
+            finished_at = datetime.datetime.now() + datetime.timedelta(seconds=time_left_in_s)
+            eta_info = f" ETA {datetime.timedelta(seconds=round(time_left_in_s))} ({finished_at:%Y-%m-%d %H:%M})"
+        print(f"\n-----------------NEW RUN [{current_run} / {total_runs}]{host_info}{eta_info}-----------------\n")
 
     @abstractmethod
     def do_run(self):
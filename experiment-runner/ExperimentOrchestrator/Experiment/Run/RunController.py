@@ -1,3 +1,5 @@
+import time
+
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 from EventManager.Models.RunnerEvents import RunnerEvents
 from EventManager.EventSubscriptionController import EventSubscriptionController
@@ -6,39 +8,65 @@ from ExperimentOrchestrator.Experiment.Run.IRunController import IRunController
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
 class RunController(IRunController):
+    def __raise_phase_event(self, event: RunnerEvents):
+        started_at, start = time.time(), time.perf_counter()
+        self.current_phase.value = event.value
+        self.phase_started_at.value = started_at
+        try:
+            return EventSubscriptionController.raise_event(event, self.run_context)
+        finally:
+            # Including the time-to-ready of the readiness probes the hook waited for
+            ready_timings = [(f"READY {name}", ready_started_at, duration_ms)
+                             for name, ready_started_at, duration_ms in self.run_context.ready_timings]
+            self.run_context.ready_timings.clear()
+            self.data_manager.append_phase_timings(self.variation['__run_id'],
+                                                   [(event.name, started_at, (time.perf_counter() - start) * 1000)] + ready_timings)
+
     @processify
     def do_run(self):
+        self.run()
+
+    def run(self):
+        # -- Reset run, in case the previous run of the same group left its state behind
+        if self.continues_group:
+            output.console_log_WARNING("Calling reset_run config hook")
+            self.__raise_phase_event(RunnerEvents.RESET_RUN)
+
         # -- Start run
         output.console_log_WARNING("Calling start_run config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.START_RUN, self.run_context)
+        self.__raise_phase_event(RunnerEvents.START_RUN)
 
         # -- Start measurement
         output.console_log_WARNING("... Starting measurement ...")
-        EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, self.run_context)
+        self.__raise_phase_event(RunnerEvents.START_MEASUREMENT)
 
         # -- Start interaction
         output.console_log_WARNING("Calling interaction config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.INTERACT, self.run_context)
+        self.__raise_phase_event(RunnerEvents.INTERACT)
         output.console_log_OK("... Run completed ...")
 
         # -- Stop measurement
         output.console_log_WARNING("... Stopping measurement ...")
-        EventSubscriptionController.raise_event(RunnerEvents.STOP_MEASUREMENT, self.run_context)
+        self.__raise_phase_event(RunnerEvents.STOP_MEASUREMENT)
 
         # -- Stop run
         output.console_log_WARNING("Calling stop_run config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.STOP_RUN, self.run_context)
+        self.__raise_phase_event(RunnerEvents.STOP_RUN)
+
+        # -- Signal the end of the run, the cooldown can already start while the run data is collected
+        self.run_completed_event.set()
 
         # -- Collect data from measurements
         output.console_log_WARNING("Calling populate_run_data config hook")
-        user_run_data = EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, self.run_context)
+        user_run_data = self.__raise_phase_event(RunnerEvents.POPULATE_RUN_DATA)
 
         if user_run_data:
             # TODO: check if data columns exist and if yes, if they match
-            updated_run_data = {**self.run_context.run_variation,
-                                **user_run_data}  # shallowly-merged dictionary. Takes values from first; replacing matching keys with values from second.
+            updated_run_data = self.run_context.run_variation.copy()
+            updated_run_data.update(user_run_data)  # shallowly-merged. Takes values from the run; replacing matching keys with the user run data.
         else:
             updated_run_data = self.run_context.run_variation
 
         updated_run_data['__done'] = RunProgress.DONE
         self.data_manager.update_row_data(updated_run_data)
+
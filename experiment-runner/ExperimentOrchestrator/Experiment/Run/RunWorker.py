@@ -0,0 +1,165 @@
+import copy
+import time
+import traceback
+import multiprocessing
+from types import ModuleType
+from typing import Dict, Optional
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Misc.ProcessTree import kill_process_tree
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+###     =========================================================
+###     |                                                       |
+###     |                       RunWorker                       |
+###     |       - Long-lived process performing runs one        |
+###     |         after another, fed over a pipe                |
+###     |       - Resets the config state before each run       |
+###     |       - Is restarted when it crashed                  |
+###     |                                                       |
+###     =========================================================
+class RunWorker:
+
+    def __init__(self, config: RunnerConfig):
+        self.config = config
+        self.run_completed_event = multiprocessing.Event()
+        self.current_phase = multiprocessing.Value('i', 0)
+        self.phase_started_at = multiprocessing.Value('d', 0.0)
+        self.run_error = None
+        self.__process = None
+        self.__connection = None
+        self.__run_in_progress = False
+
+    def start(self):
+        # The state of the config as inherited from the controller (e.g. as set by before_group), restored before every run
+        config_state = self.__copy_config_state()
+        controller_connection, worker_connection = multiprocessing.Pipe()
+        self.__process = multiprocessing.Process(target=self.__serve, args=[worker_connection, config_state], daemon=True)
+        self.__process.start()
+        worker_connection.close()
+        self.__connection = controller_connection
+
+    def stop(self):
+        if self.__process is None:
+            return
+
+        if self.__process.is_alive():
+            try:
+                self.__connection.send(None)
+            except OSError:
+                pass
+            self.__process.join(timeout=10)
+        if self.__process.is_alive():
+            self.__process.terminate()
+            self.__process.join()
+        self.__connection.close()
+        self.__process = None
+
+    def kill(self):
+        """Kills the worker together with any process spawned by the hooks, it is restarted for the next run."""
+        if self.__process is not None:
+            kill_process_tree(self.__process.pid)
+            self.__process.join()
+            self.__connection.close()
+            self.__process = None
+        self.__run_in_progress = False
+        self.run_error = "killed"
+
+    def submit(self, variation: Dict, current_run: int, total_runs: int, host: Optional[str], continues_group: bool = False,
+               time_left_in_s: Optional[float] = None):
+        if self.__process is None or not self.__process.is_alive():
+            self.start()
+
+        self.run_completed_event.clear()
+        self.current_phase.value = 0
+        self.run_error = None
+        self.__connection.send((variation, current_run, total_runs, host, continues_group, time_left_in_s))
+        self.__run_in_progress = True
+
+    def is_run_in_progress(self) -> bool:
+        if self.__run_in_progress and not self.__connection.poll() and self.__process.is_alive():
+            return True
+        return False
+
+    def wait_for_run(self, timeout: Optional[float] = None):
+        """Waits (at most `timeout` seconds) until the submitted run ended.
+        Afterwards, `run_error` is None if the run succeeded, or the reason it failed."""
+        if not self.__run_in_progress:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.__connection.poll(1 if deadline is None else max(0, min(1, deadline - time.monotonic()))):
+            if not self.__process.is_alive():
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+
+        self.__run_in_progress = False
+        try:
+            self.run_error = self.__connection.recv()
+        except EOFError:
+            self.__process.join(timeout=10)
+            output.console_log_FAIL(f"Run worker crashed (exit code {self.__process.exitcode}), it is restarted for the next run")
+            self.stop()
+            self.run_error = "run worker crashed"
+
+    def __copy_config_state(self) -> Dict:
+        # Deep copies, so that the changes the hooks make in place (e.g. appending to a list) are undone as well. The
+        # attributes declared on the config class are included, they can be changed in place just the same
+        config_state = {}
+        for cls in reversed(type(self.config).__mro__):
+            config_state.update((name, value) for name, value in vars(cls).items()
+                                if not name.startswith('__') and not isinstance(value, (type, ModuleType))
+                                and not hasattr(value, '__get__'))
+        config_state.update(vars(self.config))
+
+        memo = {id(self.config): self.config}  # attributes referring to the config keep referring to it
+        for name, value in config_state.items():
+            try:
+                config_state[name] = copy.deepcopy(value, memo)
+            except Exception as e:
+                raise BaseError(f"The config attribute {name} cannot be copied ({type(e).__name__}: {e}), which the "
+                                f"persistent run worker needs to reset it before every run. Create it in the hooks of the "
+                                f"run (from before_run on) instead, or set persistent_run_worker to False.")
+        return config_state
+
+    def __serve(self, connection, config_state: Dict):
+        data_manager = CSVOutputManager(self.config.experiment_path)
+
+        while True:
+            try:
+                job = connection.recv()
+            except EOFError:
+                return
+            if job is None:
+                return
+
+            variation, current_run, total_runs, host, continues_group, time_left_in_s = job
+            vars(self.config).clear()
+            vars(self.config).update(copy.deepcopy(config_state, {id(self.config): self.config}))
+
+            error = None
+            try:
+                output.console_log_WARNING("Calling before_run config hook")
+                started_at, start = time.time(), time.perf_counter()
+                self.current_phase.value = RunnerEvents.BEFORE_RUN.value
+                self.phase_started_at.value = started_at
+                EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+                data_manager.append_phase_timings(variation['__run_id'], [(RunnerEvents.BEFORE_RUN.name, started_at,
+                                                                           (time.perf_counter() - start) * 1000)])
+
+                run_controller = RunController(variation, self.config, current_run, total_runs, host, continues_group,
+                                               time_left_in_s)
+                run_controller.run_completed_event = self.run_completed_event
+                run_controller.current_phase = self.current_phase
+                run_controller.phase_started_at = self.phase_started_at
+                run_controller.run()
+            except Exception:
+                error = traceback.format_exc()
+                output.console_log_FAIL(f"Run {variation['__run_id']} failed:\n{error}")
+            connection.send(error)
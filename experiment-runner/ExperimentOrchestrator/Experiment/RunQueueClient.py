@@ -0,0 +1,86 @@
+import os
+import time
+import queue
+import socket
+import threading
+from multiprocessing.connection import Client, AuthenticationError
+from typing import Dict, List, Optional, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.RunTable.Models.RunTable import RunTable
+
+
+def parse_address(address: str, default_host: str = '') -> Tuple[str, int]:
+    """Parses `[host:]port`."""
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        raise BaseError(f"Invalid address {address}, expected [host:]port")
+    return host or default_host, int(port)
+
+
+###     =========================================================
+###     |                                                       |
+###     |                     RunQueueClient                    |
+###     |       - The queue of pending runs of a worker         |
+###     |         (--worker), fed by the coordinator            |
+###     |       - Reports the results of the runs back          |
+###     |                                                       |
+###     =========================================================
+class RunQueueClient:
+    CONNECT_ATTEMPTS = 12           # Survive a restart of the coordinator
+    CONNECT_INTERVAL_IN_S = 5
+    WAIT_INTERVAL_IN_S = 5          # A worker without a run asks again while the other workers finish theirs
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes, run_table: RunTable):
+        self.address = address
+        self.authkey = authkey
+        self.run_table = run_table
+        self.__stopped = False
+
+    @staticmethod
+    def __worker_name() -> str:
+        # Every host (thread) of a worker performs its own runs
+        return f"{socket.gethostname()}-{os.getpid()}/{threading.current_thread().name}"
+
+    def __request(self, message: Tuple):
+        for attempt in range(self.CONNECT_ATTEMPTS):
+            try:
+                with Client(self.address, authkey=self.authkey) as connection:
+                    connection.send(message)
+                    return connection.recv()
+            except AuthenticationError:
+                raise BaseError("The coordinator refused this worker, it performs the experiment with a different config (md5sum)!")
+            except (ConnectionError, EOFError) as e:
+                output.console_log_WARNING(f"Could not reach the coordinator at {self.address[0]}:{self.address[1]} ({e}), "
+                                           f"retrying in {self.CONNECT_INTERVAL_IN_S}s...")
+                time.sleep(self.CONNECT_INTERVAL_IN_S)
+        raise BaseError(f"The coordinator at {self.address[0]}:{self.address[1]} is unreachable!")
+
+    def get_nowait(self) -> List[Dict]:
+        """The next run to perform, as a batch of one run. Raises queue.Empty once the experiment is completed."""
+        while not self.__stopped:
+            reply = self.__request(('next', self.__worker_name()))
+            if reply[0] == 'run' and self.run_table.get(reply[1]) is not None:
+                return [self.run_table.get(reply[1])]
+            if reply[0] == 'run':
+                raise BaseError(f"The coordinator handed out run {reply[1]}, which is not part of the experiment!")
+            if reply[0] == 'error':
+                raise BaseError(f"The coordinator could not hand out a run: {reply[1]}")
+            if reply[0] == 'wait':
+                time.sleep(reply[1])
+            else:
+                self.__stopped = True
+        raise queue.Empty
+
+    def report(self, variation: Dict, run_data: Dict, failure: Optional[str]):
+        reply = self.__request(('result', self.__worker_name(), variation['__run_id'], run_data, failure))
+        if reply[0] == 'error':
+            output.console_log_FAIL(f"The coordinator could not store the result of run {variation['__run_id']}: {reply[1]}")
+
+    def release(self, variation: Dict):
+        """Hands the run back to the coordinator without performing it, no next runs are requested anymore."""
+        reply = self.__request(('release', self.__worker_name(), variation['__run_id']))
+        if reply[0] == 'error':
+            output.console_log_FAIL(f"The coordinator could not take back run {variation['__run_id']}: {reply[1]}")
+        self.__stopped = True
@@ -0,0 +1,108 @@
+import re
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+def run_number(run_id: str) -> int:
+    return int(run_id.split('_')[-1])
+
+
+###     =========================================================
+###     |                                                       |
+###     |                     RunTableShard                     |
+###     |       - Slice of the run table performed by one       |
+###     |         controller machine (--shard)                  |
+###     |       - Merge the results of all shards into one      |
+###     |         experiment (merge command)                    |
+###     |                                                       |
+###     =========================================================
+class RunTableShard:
+
+    def __init__(self, spec: str):
+        """`spec` is either `i/N`, the i-th (1-based) of N shards, or a comma separated list of run ids."""
+        match = re.fullmatch(r'(\d+)/(\d+)', spec)
+        if match:
+            self.index, self.count = int(match.group(1)), int(match.group(2))
+            if not 1 <= self.index <= self.count:
+                raise BaseError(f"Invalid shard {spec}, expected i/N with 1 <= i <= N!")
+            self.run_ids = None
+            self.label = f"{self.index}of{self.count}"
+        else:
+            self.run_ids = [run_id.strip() for run_id in spec.split(',') if run_id.strip()]
+            if not self.run_ids or not all(re.fullmatch(r'run_\d+', run_id) for run_id in self.run_ids):
+                raise BaseError(f"Invalid shard {spec}, expected i/N or a comma separated list of run ids (run_<nr>)!")
+            self.label = hashlib.md5(','.join(sorted(self.run_ids)).encode()).hexdigest()[:8]
+
+    def experiment_path(self, experiment_path: Path) -> Path:
+        return experiment_path.with_name(f"{experiment_path.name}_shard_{self.label}")
+
+    def select(self, run_table: List[Dict], run_table_model: RunTableModel) -> List[Dict]:
+        """The runs of the shard, in the order of the run table.
+        The run table is split by treatment combination, so that all repetitions of a combination share a shard."""
+        if self.run_ids is not None:
+            unknown_run_ids = set(self.run_ids) - set(variation['__run_id'] for variation in run_table)
+            if unknown_run_ids:
+                raise BaseError(f"The shard contains unknown runs: {', '.join(sorted(unknown_run_ids))}")
+            return [variation for variation in run_table if variation['__run_id'] in self.run_ids]
+
+        # The run ids do not depend on shuffling, so every controller machine assigns the cells to the same shards
+        cells = []
+        for variation in sorted(run_table, key=lambda v: run_number(v['__run_id'])):
+            cell = run_table_model.get_cell(variation)
+            if not cells or cells[-1] != cell:
+                cells.append(cell)
+        if len(cells) < self.count:
+            raise BaseError(f"Cannot split {len(cells)} treatment combinations over {self.count} shards!")
+
+        shard_cells = set(cell for i, cell in enumerate(cells) if i * self.count // len(cells) == self.index - 1)
+        return [variation for variation in run_table if run_table_model.get_cell(variation) in shard_cells]
+
+    @staticmethod
+    def merge(destination: Path, shard_paths: List[Path]):
+        """Combines the experiment folders of the shards into the experiment folder `destination`."""
+        run_tables, metadata = [], []
+        for shard_path in shard_paths:
+            if not (shard_path / 'run_table.csv').exists():
+                raise BaseError(f"No run table found in shard {shard_path}")
+            run_tables.append(CSVOutputManager(shard_path).read_run_table())
+            metadata.append(JSONOutputManager(shard_path).read_metadata())
+
+        for shard_path, run_table, shard_metadata in zip(shard_paths, run_tables, metadata):
+            if shard_metadata.md5sum != metadata[0].md5sum:
+                raise BaseError(f"md5sum mismatch! Shard {shard_path} was performed with a different config than {shard_paths[0]}")
+            if set(run_table[0].keys()) != set(run_tables[0][0].keys()):
+                raise BaseError(f"Shard {shard_path} does not define the same columns as {shard_paths[0]}")
+
+        merged_run_table = [variation for run_table in run_tables for variation in run_table]
+        run_ids = [variation['__run_id'] for variation in merged_run_table]
+        if len(set(run_ids)) != len(run_ids):
+            raise BaseError("The shards overlap, some runs occur in more than one shard!")
+        merged_run_table.sort(key=lambda variation: run_number(variation['__run_id']))
+
+        destination.mkdir(parents=True, exist_ok=False)
+        csv_data_manager = CSVOutputManager(destination)
+        csv_data_manager.write_run_table(merged_run_table)
+        JSONOutputManager(destination).write_metadata(metadata[0])
+
+        for shard_path, run_table in zip(shard_paths, run_tables):
+            for variation in run_table:
+                if (shard_path / variation['__run_id']).is_dir():
+                    shutil.copytree(shard_path / variation['__run_id'], destination / variation['__run_id'],
+                                    ignore=shutil.ignore_patterns('*.lock', 'run_table.journal'))
+
+            timings: Dict[str, List] = {}
+            for timing in CSVOutputManager(shard_path).read_phase_timings():
+                timings.setdefault(timing['__run_id'], []).append((timing['phase'], timing['started_at'], timing['duration_ms']))
+            for run_id, run_timings in timings.items():
+                csv_data_manager.append_phase_timings(run_id, run_timings)
+        csv_data_manager.close()
+
+        output.console_log_OK(f"Merged {len(merged_run_table)} runs of {len(shard_paths)} shards into: {destination}")
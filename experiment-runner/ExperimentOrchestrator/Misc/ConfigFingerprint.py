@@ -0,0 +1,115 @@
+import ast
+import sys
+import enum
+import inspect
+import hashlib
+import textwrap
+from pathlib import Path
+from typing import Dict, List
+
+import dill as pickle
+
+# The hooks that perform the measurement of a run, and the other hooks. The other methods of the config (and functions
+# of the config file) may be called by any hook.
+MEASUREMENT_HOOKS = ['start_run', 'start_measurement', 'interact', 'stop_measurement']
+OTHER_HOOKS = ['__init__', 'create_run_table_model', 'before_experiment', 'before_group', 'before_run', 'reset_run',
+               'stop_run', 'populate_run_data', 'after_group', 'after_experiment']
+
+# The config methods and attributes that do not influence the results of the runs
+RESULT_NEUTRAL_METHODS = ['__init__', 'create_run_table_model', 'after_group', 'after_experiment']
+RESULT_NEUTRAL_ATTRIBUTES = ['ROOT_DIR', 'name', 'results_output_path', 'experiment_path', 'run_table_model',
+                             'operation_type', 'hosts', 'persistent_run_worker', 'group_factors', 'phase_timeouts_in_ms',
+                             'run_retries', 'retry_backoff_in_ms', 'time_budget_in_ms', 'simulated_phase_durations_in_ms',
+                             'result_cache_path', 'result_cache_max_age_in_ms', 'system_under_test']
+
+
+def calc_ast_md5sum(src, name):
+    tree = compile(src, name, 'exec', flags=ast.PyCF_ONLY_AST, optimize=0)
+
+    for node in ast.walk(tree):
+        # Ignores empty lines and comment only lines
+        if hasattr(node, 'lineno'):
+            setattr(node, 'lineno', 0)
+        if hasattr(node, 'col_offset'):
+            setattr(node, 'col_offset', 0)
+        if hasattr(node, 'end_lineno'):
+            setattr(node, 'end_lineno', 0)
+        if hasattr(node, 'end_col_offset'):
+            setattr(node, 'end_col_offset', 0)
+
+        # Ignore docstring
+        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef, ast.ClassDef, ast.Module)) and ast.get_docstring(node) is not None:
+            docstring_node = node.body[0].value
+            if isinstance(docstring_node, ast.Str):
+                docstring_node.s = ''
+            elif isinstance(docstring_node, ast.Constant) and isinstance(docstring_node.value, str):
+                docstring_node.value = ''
+
+    return hashlib.md5(pickle.dumps(tree)).digest()
+
+
+def method_fingerprints(config) -> Dict[str, str]:
+    """The AST md5sum (hex) of every method of the config class, and of every function defined in the config file
+    (which the hooks may call), by name. The names of the functions are prefixed with `module.`."""
+    functions = {name: function for name, function in inspect.getmembers(type(config), inspect.isfunction)
+                 if function.__module__ == type(config).__module__}
+    config_module = sys.modules.get(type(config).__module__)
+    if config_module is not None:
+        functions.update({f"module.{name}": function
+                          for name, function in inspect.getmembers(config_module, inspect.isfunction)
+                          if function.__module__ == config_module.__name__})
+
+    fingerprints = {}
+    for name, function in functions.items():
+        try:
+            source = textwrap.dedent(inspect.getsource(function))
+        except (OSError, TypeError):
+            source = function.__qualname__  # e.g. defined in an interactive session
+        fingerprints[name] = calc_ast_md5sum(source, name).hex()
+    return fingerprints
+
+
+def attribute_fingerprints(config) -> Dict[str, str]:
+    """The md5sum (hex) of the value of every (class or instance) attribute of the config, by name."""
+    fingerprints = {}
+    for name in dir(config):
+        if name.startswith('__'):
+            continue
+        value = getattr(config, name)
+        if inspect.ismethod(value) or inspect.isfunction(value):
+            continue
+        fingerprints[name] = hashlib.md5(_stable_repr(value).encode()).hexdigest()
+    return fingerprints
+
+
+def result_fingerprint(config) -> Dict[str, str]:
+    """The fingerprints of the methods and attributes of the config that may influence the results of the runs."""
+    fingerprints = {name: fingerprint for name, fingerprint in method_fingerprints(config).items()
+                    if name not in RESULT_NEUTRAL_METHODS}
+    fingerprints.update({name: fingerprint for name, fingerprint in attribute_fingerprints(config).items()
+                         if name not in RESULT_NEUTRAL_ATTRIBUTES})
+    return fingerprints
+
+
+def changed_fingerprints(stored: Dict[str, str], current: Dict[str, str]) -> List[str]:
+    """The names of which the fingerprint changed, was added or was removed."""
+    return sorted(name for name in set(stored) | set(current) if stored.get(name) != current.get(name))
+
+
+def _stable_repr(value, depth: int = 0) -> str:
+    # The default repr of objects holds their memory address, which differs between invocations
+    if depth > 8:
+        return '...'  # e.g. objects referring to each other
+    if isinstance(value, dict):
+        return '{' + ', '.join(f"{_stable_repr(k, depth + 1)}: {_stable_repr(v, depth + 1)}"
+                               for k, v in sorted(value.items(), key=lambda item: repr(item[0]))) + '}'
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        return f"{type(value).__name__}[" + ', '.join(_stable_repr(item, depth + 1) for item in items) + ']'
+    if isinstance(value, (str, int, float, bool, bytes, enum.Enum, Path)) or value is None:
+        return repr(value)
+    if inspect.isfunction(value) or inspect.isclass(value):
+        return f"{value.__module__}.{value.__qualname__}"
+    if type(value).__repr__ is object.__repr__ and hasattr(value, '__dict__'):
+        return f"{type(value).__qualname__}({_stable_repr(vars(value), depth + 1)})"
+    return repr(value)
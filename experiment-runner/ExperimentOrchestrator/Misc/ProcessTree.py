@@ -0,0 +1,20 @@
+import psutil
+
+
+def kill_process_tree(pid: int):
+    '''
+    Kills the process `pid`, together with all processes it (indirectly) spawned.
+    The process `pid` itself is not reaped, it is expected to be joined by its parent.
+    '''
+    try:
+        process = psutil.Process(pid)
+        descendants = process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return
+
+    for descendant in descendants + [process]:
+        try:
+            descendant.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(descendants, timeout=10)
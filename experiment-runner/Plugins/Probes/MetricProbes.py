@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ConnectionHandler import ConnectionHandler
+
+
+class CPUUtilisation:
+    """CPU utilisation (%) since the previous sample, read from /proc/stat.
+    Of the local machine, or of `host_name` (see `ConnectionHandler`) if given. The previous sample is kept per probe,
+    a `CooldownPolicy` gives every host of the pool its own copy."""
+
+    def __init__(self, host_name: Optional[str] = None):
+        self.connection = ConnectionHandler(host_name) if host_name else None
+        self.previous: Optional[Tuple[int, int]] = None
+
+    def __read_cpu_times(self) -> List[int]:
+        if self.connection:
+            line = self.connection.get_remote_command_output("head -n 1 /proc/stat")
+        else:
+            with open('/proc/stat', 'r') as stat_file:
+                line = stat_file.readline()
+        return [int(value) for value in line.split()[1:]]
+
+    def __call__(self) -> float:
+        cpu_times = self.__read_cpu_times()
+        idle, total = cpu_times[3] + cpu_times[4], sum(cpu_times)  # idle + iowait
+
+        previous, self.previous = self.previous, (idle, total)
+        if previous is None or total == previous[1]:
+            return 0.0
+        return 100.0 * (1 - (idle - previous[0]) / (total - previous[1]))
+
+
+class ThermalZoneTemperature:
+    """Temperature (°C) of /sys/class/thermal/thermal_zone`zone`.
+    Of the local machine, or of `host_name` (see `ConnectionHandler`) if given."""
+
+    def __init__(self, zone: int = 0, host_name: Optional[str] = None):
+        self.path = Path(f"/sys/class/thermal/thermal_zone{zone}/temp")
+        self.connection = ConnectionHandler(host_name) if host_name else None
+
+    def __call__(self) -> float:
+        if self.connection:
+            millidegrees = self.connection.get_remote_command_output(f"cat {self.path}")
+        else:
+            millidegrees = self.path.read_text()
+        return int(millidegrees) / 1000
+
+
+class LatestPowerSample:
+    """The last power sample written to a (growing) log file, e.g. by `Plugins.Profilers.WattsUpPro`.
+    `field` is the whitespace separated field holding the power, by default the one of the WattsUpPro log format."""
+
+    def __init__(self, log_file: Path, field: int = 3):
+        self.log_file = Path(log_file)
+        self.field = field
+
+    def __call__(self) -> float:
+        with open(self.log_file, 'rb') as log:
+            log.seek(0, os.SEEK_END)
+            log.seek(max(0, log.tell() - 4096))  # only the tail of the log is of interest
+            lines = log.read().decode(errors='ignore').strip().splitlines()
+        return float(lines[-1].split()[self.field])
@@ -0,0 +1,58 @@
+import socket
+import urllib.request
+from typing import Callable
+
+from ConnectionHandler import ConnectionHandler
+
+
+class RemoteCommandOutput:
+    """Ready once the output of `command`, executed on `host_name` (see `ConnectionHandler`), passes `predicate`."""
+
+    def __init__(self, host_name: str, command: str, predicate: Callable[[str], bool]):
+        self.connection = ConnectionHandler(host_name)
+        self.command = command
+        self.predicate = predicate
+        self.__name__ = f"'{command}' on {host_name}"
+
+    def __call__(self) -> bool:
+        return self.predicate(self.connection.get_remote_command_output(self.command))
+
+
+class HTTPStatus:
+    """Ready once `url` answers with HTTP status `status`."""
+
+    def __init__(self, url: str, status: int = 200, request_timeout_in_s: float = 5):
+        self.url = url
+        self.status = status
+        self.request_timeout_in_s = request_timeout_in_s
+        self.__name__ = url
+
+    def __call__(self) -> bool:
+        with urllib.request.urlopen(self.url, timeout=self.request_timeout_in_s) as response:
+            return response.status == self.status
+
+
+class TCPPortOpen:
+    """Ready once a TCP connection to `host`:`port` can be established."""
+
+    def __init__(self, host: str, port: int, connect_timeout_in_s: float = 5):
+        self.host = host
+        self.port = port
+        self.connect_timeout_in_s = connect_timeout_in_s
+        self.__name__ = f"{host}:{port}"
+
+    def __call__(self) -> bool:
+        with socket.create_connection((self.host, self.port), timeout=self.connect_timeout_in_s):
+            return True
+
+
+class ContainerCount:
+    """Ready once at least `minimum` docker containers are running on `host_name` (see `ConnectionHandler`)."""
+
+    def __init__(self, host_name: str, minimum: int):
+        self.connection = ConnectionHandler(host_name)
+        self.minimum = minimum
+        self.__name__ = f"{minimum} containers on {host_name}"
+
+    def __call__(self) -> bool:
+        return self.connection.get_containers_count() >= self.minimum
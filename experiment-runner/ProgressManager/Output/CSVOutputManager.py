@@ -3,41 +3,99 @@ from ConfigValidator.CustomErrors.ExperimentOutputErrors import ExperimentOutput
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from ProgressManager.Output.BaseOutputManager import BaseOutputManager
 
+from contextlib import contextmanager
 from tempfile import NamedTemporaryFile
-import shutil
+import fcntl
+import json
 import csv
-from typing import Dict, List
+import io
+import os
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+import pandas
 
 
 class CSVOutputManager(BaseOutputManager):
-    def read_run_table(self) -> List[Dict]:
-        read_run_table = []
-        try:
-            with open(self._experiment_path / 'run_table.csv', 'r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    # if value was integer, stored as string by CSV writer, then convert back to integer.
-                    for key, value in row.items():
-                        if value.isnumeric():
-                            row[key] = int(value)
+    # The updates of rows are appended to run_table.journal (one record per update) instead of rewriting run_table.csv,
+    # they are merged into run_table.csv (compacted) at the start and end of the experiment, whenever the journal grew
+    # to `min_journal_size` during the experiment, and when the run table is written. Reading the run table merges the
+    # journal in memory, without writing
 
-                        if key == '__done':
-                            row[key] = RunProgress[value]
+    def __init__(self, experiment_path):
+        super().__init__(experiment_path)
+        self.__journal_offset = 0                           # the journal records read so far by `read_row_updates`
+        self.__journal_rows: Dict[str, Dict] = {}
 
-                    read_run_table.append(row)
-            
-            return read_run_table
-        except:
+    def read_run_table(self, dtypes: Optional[Dict[str, Optional[type]]] = None) -> List[Dict]:
+        """Reads the stored run table (incl. the updates in its journal), converting its columns to the given `dtypes`
+        (see `RunTableModel.get_column_dtypes`). The type of other columns is inferred (int, float, bool or str),
+        numbers in columns that also hold text are converted one by one. Values that do not match the dtype of their
+        column are kept as stored, and empty cells are read back as " ", as in a new run table."""
+        dtypes = {'__run_id': str, '__done': RunProgress, **(dtypes or {})}
+        try:
+            stored_csv = self._experiment_path / 'run_table.csv'
+            updated_rows = self.__read_journal()
+            if updated_rows:
+                with open(stored_csv, 'r', newline='') as csvfile:
+                    stored_csv = io.StringIO()
+                    self.__merge_journal(csvfile, stored_csv, updated_rows)
+                stored_csv.seek(0)
+
+            # The columns are parsed (and their types inferred) by pandas as a whole, the rows are only assembled after
+            stored_run_table = pandas.read_csv(stored_csv,
+                                               dtype={column_name: 'string' for column_name, dtype in dtypes.items()
+                                                      if dtype in [str, RunProgress]},
+                                               keep_default_na=False, na_values=['', ' '], dtype_backend='numpy_nullable')
+        except FileNotFoundError:
             raise ExperimentOutputFileDoesNotExistError
 
+        column_names = list(stored_run_table.columns)
+        columns = [self.__typed_column(stored_run_table[column_name], dtypes.get(column_name))
+                   for column_name in column_names]
+        return [dict(zip(column_names, row)) for row in zip(*columns)]
+
+    @staticmethod
+    def __typed_column(values: pandas.Series, dtype: Optional[type]) -> List:
+        if dtype is RunProgress:
+            return [RunProgress[value] for value in values.tolist()]
+
+        inferred_dtype = {'Int64': int, 'Float64': float, 'boolean': bool}.get(str(values.dtype), str)
+        if dtype is float and inferred_dtype is int:
+            values, inferred_dtype = values.astype('Float64'), float
+        if dtype is inferred_dtype or (dtype is None and inferred_dtype is not str):
+            return [" " if value is pandas.NA else value for value in values.tolist()]
+
+        # The column holds values of another type than declared, or (if not declared) numbers and text
+        candidate_dtypes = [int, float] if dtype is None else [dtype]
+        def parse(value: str):
+            if value is pandas.NA:
+                return " "
+            for candidate_dtype in candidate_dtypes:
+                try:
+                    return {'True': True, 'False': False}[value] if candidate_dtype is bool else candidate_dtype(value)
+                except (KeyError, ValueError):
+                    pass
+            return value
+        return [parse(value) for value in values.astype('string').tolist()]
+
+    @staticmethod
+    def __stored_value(value):
+        # Enum values (e.g. __done) are stored by name
+        return value.name if isinstance(value, Enum) else value
+
     def write_run_table(self, run_table: List[Dict]):
         try:
-            with open(self._experiment_path / 'run_table.csv', 'w', newline='') as myfile:
-                writer = csv.DictWriter(myfile, fieldnames=list(run_table[0].keys()))
-                writer.writeheader()
-                for data in run_table:
-                    data['__done'] = data['__done'].name
-                    writer.writerow(data)
+            with self.__locked():
+                self.__compact()  # a journal left behind would otherwise be replayed onto the new run table
+                tempfile = NamedTemporaryFile(mode='w', dir=self._experiment_path, delete=False, newline='')
+                with tempfile:
+                    column_names = list(run_table[0].keys())
+                    writer = csv.writer(tempfile)
+                    writer.writerow(column_names)
+                    for data in run_table:
+                        writer.writerow([self.__stored_value(data[column_name]) for column_name in column_names])
+                os.replace(tempfile.name, self._experiment_path / 'run_table.csv')
         except:
             raise ExperimentOutputFileDoesNotExistError
 
@@ -45,25 +103,157 @@ class CSVOutputManager(BaseOutputManager):
     def shuffle_experiment_run_table(self):
         pass
     
+    @contextmanager
+    def __locked(self):
+        # Runs on different hosts can finish at the same time, serialize the writes to the output files
+        with open(self._experiment_path / 'run_table.csv.lock', 'w') as lockfile:
+            fcntl.flock(lockfile, fcntl.LOCK_EX)
+            yield
+
+    def __append_to_journal(self, run_id: str, updated_columns: Dict):
+        record = {'__run_id': run_id, 'columns': {column: self.__stored_value(value)
+                                                  for column, value in updated_columns.items()}}
+        with self.__locked():
+            with open(self._experiment_path / 'run_table.journal', 'ab+') as journal:
+                # A process killed while appending (e.g. a run exceeding its timeout) leaves a torn record behind
+                if journal.seek(0, os.SEEK_END) > 0:
+                    journal.seek(-1, os.SEEK_END)
+                    if journal.read(1) != b'\n':
+                        journal.write(b'\n')
+                journal.write((json.dumps(record, default=str) + '\n').encode())
+                journal.flush()
+                os.fsync(journal.fileno())
+
+    def compact_run_table(self, min_journal_size: int = 0):
+        """Merges the updates in the journal into run_table.csv, if the journal holds at least `min_journal_size` bytes.
+        Only the process that reads the updates of the runs (`read_row_updates`) compacts while runs are performed."""
+        journal_file = self._experiment_path / 'run_table.journal'
+        if not journal_file.exists() or journal_file.stat().st_size < min_journal_size:
+            return
+        with self.__locked():
+            self.__compact()
+
+    def close(self):
+        """Compacts the run table and removes its lock file. Only once no other process writes to the experiment folder
+        anymore (i.e. at the end of the session), as a process still waiting for the removed lock file would not
+        exclude the processes that lock a new one."""
+        self.compact_run_table()
+        try:
+            os.remove(self._experiment_path / 'run_table.csv.lock')
+        except FileNotFoundError:
+            pass
+
+    def __compact(self):
+        # Only while locked. The journal is emptied after run_table.csv was replaced: if interrupted in between, the
+        # journal is merged again, which is harmless as its records hold the updated values (not changes to them)
+        journal_file = self._experiment_path / 'run_table.journal'
+        if not journal_file.exists() or journal_file.stat().st_size == 0:
+            return
+
+        updated_rows = self.__read_journal()
+        tempfile = NamedTemporaryFile(mode='w', dir=self._experiment_path, delete=False, newline='')
+        with open(self._experiment_path / 'run_table.csv', 'r', newline='') as csvfile, tempfile:
+            self.__merge_journal(csvfile, tempfile, updated_rows)
+            tempfile.flush()
+            os.fsync(tempfile.fileno())
+        os.replace(tempfile.name, self._experiment_path / 'run_table.csv')
+        open(journal_file, 'w').close()
+        # The updates that were not read yet are merged into run_table.csv now, keep them for `read_row_updates`
+        for run_id, updated_columns in updated_rows.items():
+            self.__journal_rows.setdefault(run_id, {}).update(updated_columns)
+        self.__journal_offset = 0
+
+    @staticmethod
+    def __merge_journal(csvfile, merged_csvfile, updated_rows: Dict[str, Dict]):
+        reader = csv.DictReader(csvfile)
+        writer = csv.DictWriter(merged_csvfile, fieldnames=reader.fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for row in reader:
+            writer.writerow({**row, **updated_rows.get(row['__run_id'], {})})
+
+    def read_row_updates(self, run_id: str) -> Dict:
+        """The columns of the run that were updated through the journal, as stored (e.g. enums by name), including the
+        updates compacted by this manager. Only the records appended to the journal since the previous call are read."""
+        try:
+            with self.__locked(), open(self._experiment_path / 'run_table.journal', 'rb') as journal:
+                if journal.seek(0, os.SEEK_END) < self.__journal_offset:
+                    self.__journal_offset, self.__journal_rows = 0, {}  # compacted by another process
+                journal.seek(self.__journal_offset)
+                for line in journal:
+                    if not line.endswith(b'\n'):
+                        break  # still being appended
+                    self.__journal_offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.__journal_rows.setdefault(record['__run_id'], {}).update(record['columns'])
+        except FileNotFoundError:
+            pass
+        return dict(self.__journal_rows.get(run_id, {}))
+
+    def __read_journal(self) -> Dict[str, Dict]:
+        """The updated columns per run id, as recorded in the journal."""
+        updated_rows: Dict[str, Dict] = {}
+        try:
+            with open(self._experiment_path / 'run_table.journal', 'r') as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn by a process killed while appending, the next records start on a new line
+                    updated_rows.setdefault(record['__run_id'], {}).update(record['columns'])
+        except FileNotFoundError:
+            pass
+        return updated_rows
+
+    def append_phase_timings(self, run_id: str, timings: List[Tuple[str, float, float]]):
+        """Appends the (phase, started_at, duration_ms) timings of a run to phase_timings.csv."""
+        timings_file = self._experiment_path / 'phase_timings.csv'
+        with self.__locked():
+            write_header = not timings_file.exists()
+            with open(timings_file, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(['__run_id', 'phase', 'started_at', 'duration_ms'])
+                for phase, started_at, duration_ms in timings:
+                    writer.writerow([run_id, phase, f"{started_at:.6f}", f"{duration_ms:.3f}"])
+
+    def read_phase_timings(self) -> List[Dict]:
+        try:
+            with open(self._experiment_path / 'phase_timings.csv', 'r') as csvfile:
+                return [{**row, 'started_at': float(row['started_at']), 'duration_ms': float(row['duration_ms'])}
+                        for row in csv.DictReader(csvfile)]
+        except FileNotFoundError:
+            return []
+
+    def rename_runs_in_phase_timings(self, run_ids: Dict[str, str]):
+        """Renames the runs of the stored phase timings, from the keys of `run_ids` to their values."""
+        timings_file = self._experiment_path / 'phase_timings.csv'
+        if not timings_file.exists():
+            return
+        with self.__locked():
+            # Written aside in the experiment folder, so that it is moved in place at once
+            tempfile = NamedTemporaryFile(mode='w', dir=self._experiment_path, delete=False, newline='')
+            with open(timings_file, 'r') as csvfile, tempfile:
+                reader = csv.DictReader(csvfile)
+                writer = csv.DictWriter(tempfile, fieldnames=reader.fieldnames)
+                writer.writeheader()
+                for row in reader:
+                    writer.writerow({**row, '__run_id': run_ids.get(row['__run_id'], row['__run_id'])})
+
+            os.replace(tempfile.name, timings_file)
+
     def update_row_data(self, updated_row: dict):
-        tempfile = NamedTemporaryFile(mode='w', delete=False)
-
-        with open(self._experiment_path / 'run_table.csv', 'r') as csvfile, tempfile:
-            reader = csv.DictReader(csvfile, fieldnames=list(updated_row.keys()))
-            writer = csv.DictWriter(tempfile, fieldnames=list(updated_row.keys()))
-
-            for row in reader:
-                if row['__run_id'] == updated_row['__run_id']:
-                    # When the row is updated, it is an ENUM value again.
-                    # Write as human-readable: enum_value.name
-                    updated_row['__done'] = updated_row['__done'].name
-                    writer.writerow(updated_row)
-                else:
-                    writer.writerow(row)
-
-        shutil.move(tempfile.name, self._experiment_path / 'run_table.csv')
+        # Enum values (e.g. __done) are written as human-readable: enum_value.name
+        self.__append_to_journal(updated_row['__run_id'], updated_row)
         output.console_log_WARNING(f"CSVManager: Updated row {updated_row['__run_id']}")
 
+    def update_row_columns(self, run_id: str, updated_columns: Dict):
+        """Only updates the given columns of a row, the other columns keep their stored value."""
+        self.__append_to_journal(run_id, updated_columns)
+        output.console_log_WARNING(f"CSVManager: Updated {', '.join(updated_columns.keys())} of row {run_id}")
+
         # with open(self.experiment_path + '/run_table.csv', 'w', newline='') as myfile:
         #     wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
         #     wr.writerow(updated_row)
@@ -0,0 +1,54 @@
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Dict, List, Optional
+
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class ResultCache:
+    """The results (run data) of completed runs, shared by experiments. A result is stored under the hash of what
+    determines it: the fingerprint of the config (see `ConfigFingerprint.result_fingerprint`), the treatments (and
+    repetition) of the run and the System Under Test it was measured on. Each result is a JSON file in `cache_path`."""
+
+    def __init__(self, cache_path: Path, config_fingerprint: Dict[str, str], factor_names: List[str],
+                 max_age_in_ms: Optional[int] = None):
+        self.__cache_path = cache_path
+        self.__config_fingerprint = config_fingerprint
+        self.__factor_names = factor_names
+        self.__max_age_in_ms = max_age_in_ms
+        self.__cache_path.mkdir(parents=True, exist_ok=True)
+
+    def key_of(self, variation: Dict, system_under_test: str) -> str:
+        key = {'config': self.__config_fingerprint,
+               'treatments': {factor_name: str(variation[factor_name]) for factor_name in self.__factor_names},
+               'repetition': int(variation.get('__repetition', 1)),  # a run of an experiment without repetitions is the first
+               'system_under_test': system_under_test}
+        return hashlib.md5(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    def lookup(self, variation: Dict, system_under_test: str) -> Optional[Dict]:
+        """The cached result of the run: {'cached_at', 'source', 'run_data'}, if it is fresh enough."""
+        try:
+            with open(self.__cache_path / f"{self.key_of(variation, system_under_test)}.json", 'r') as cache_file:
+                result = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            output.console_log_WARNING(f"Ignoring the unreadable cached result of run {variation['__run_id']}: {e}")
+            return None
+
+        if self.__max_age_in_ms is not None and (time.time() - result['cached_at']) * 1000 > self.__max_age_in_ms:
+            return None
+        return result
+
+    def store(self, variation: Dict, system_under_test: str, run_data: Dict, source: str):
+        """Stores the run data of the completed run, `source` tells where it was measured (its run folder)."""
+        result = {'cached_at': time.time(), 'source': source, 'run_data': run_data}
+
+        # Written aside and moved in place, as other experiments may read the cache at the same time
+        with NamedTemporaryFile(mode='w', dir=self.__cache_path, suffix='.tmp', delete=False) as cache_file:
+            json.dump(result, cache_file, indent=2, default=str)
+        os.replace(cache_file.name, self.__cache_path / f"{self.key_of(variation, system_under_test)}.json")
@@ -0,0 +1,38 @@
+from typing import Dict, Optional, Tuple
+
+
+class RunDurationModel:
+    """The durations of the completed runs, per cell (treatment combination), to predict the duration of pending runs.
+    A run of a cell without completed runs is expected to take as long as an average run of any cell.
+    Only the running total, count and maximum are kept, so that a prediction does not depend on the number of runs."""
+
+    def __init__(self):
+        self.__totals: Dict[Optional[Tuple], Tuple[float, int, float]] = {}  # cell (None: any cell) -> (sum, count, max)
+
+    def add_duration(self, cell: Tuple, duration_in_s: float):
+        for key in [cell, None]:
+            total, count, longest = self.__totals.get(key, (0.0, 0, duration_in_s))
+            self.__totals[key] = (total + duration_in_s, count + 1, max(longest, duration_in_s))
+
+    def __totals_of(self, cell: Tuple) -> Optional[Tuple[float, int, float]]:
+        return self.__totals.get(cell) or self.__totals.get(None)
+
+    def expected_duration(self, cell: Tuple) -> Optional[float]:
+        totals = self.__totals_of(cell)
+        return totals[0] / totals[1] if totals else None
+
+    def longest_duration(self, cell: Tuple) -> Optional[float]:
+        totals = self.__totals_of(cell)
+        return totals[2] if totals else None
+
+    def expected_time_left(self, pending_runs: Dict[Tuple, int], parallelism: int = 1) -> Optional[float]:
+        """The expected time (in s) to perform the given number of pending runs per cell, by `parallelism` hosts."""
+        time_left = 0.0
+        for cell, count in pending_runs.items():
+            if count <= 0:
+                continue
+            expected_duration = self.expected_duration(cell)
+            if expected_duration is None:
+                return None
+            time_left += expected_duration * count
+        return time_left / parallelism
@@ -2,4 +2,7 @@ from enum import Enum
 
 class RunProgress(Enum):
     TODO = 1
-    DONE = 2
\ No newline at end of file
+    DONE = 2
+    FAILED = 3
+    SKIPPED = 4
+    IN_PROGRESS = 5     # Handed out to a worker by the coordinator
\ No newline at end of file
@@ -0,0 +1,80 @@
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class RunRecord(MutableMapping):
+    """A run (row) of the run table. Behaves as a dict of its columns, but only holds a list of its values: the
+    positions of the columns are shared by all runs of a run table, and the factor treatments are shared with the
+    factors. Columns that are not part of the run table (e.g. extra run data) are kept aside, as in a dict."""
+
+    __slots__ = ('__positions', '__values', '__extra')
+
+    def __init__(self, positions: Dict[str, int], values: List[Any]):
+        """`positions` maps the column names to their index in `values`, and is shared with the other runs."""
+        self.__positions = positions
+        self.__values = values
+        self.__extra: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def positions_of(column_names: List[str]) -> Dict[str, int]:
+        return {column_name: position for position, column_name in enumerate(column_names)}
+
+    def __getitem__(self, key: str) -> Any:
+        position = self.__positions.get(key)
+        if position is not None:
+            return self.__values[position]
+        if self.__extra is not None and key in self.__extra:
+            return self.__extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        position = self.__positions.get(key)
+        if position is not None:
+            self.__values[position] = value
+        else:
+            if self.__extra is None:
+                self.__extra = {}
+            self.__extra[key] = value
+
+    def __delitem__(self, key: str):
+        if self.__extra is None or key not in self.__extra:
+            raise KeyError(f"Column {key} of the run table cannot be deleted")
+        del self.__extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.__positions
+        if self.__extra is not None:
+            yield from self.__extra
+
+    def __len__(self) -> int:
+        return len(self.__positions) + (len(self.__extra) if self.__extra is not None else 0)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__positions or (self.__extra is not None and key in self.__extra)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RunRecord) and other.__positions is self.__positions:
+            return self.__values == other.__values and (self.__extra or {}) == (other.__extra or {})
+        return super().__eq__(other)
+
+    __hash__ = None  # mutable, as a dict
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> 'RunRecord':
+        record = RunRecord(self.__positions, list(self.__values))
+        if self.__extra is not None:
+            record.__extra = dict(self.__extra)
+        return record
+
+    def __reduce__(self):
+        # The positions are pickled once for all runs of a run table, and only the values per run
+        return _restore_run_record, (self.__positions, self.__values, self.__extra)
+
+
+def _restore_run_record(positions: Dict[str, int], values: List[Any], extra: Optional[Dict[str, Any]]) -> RunRecord:
+    record = RunRecord(positions, values)
+    if extra:
+        record.update(extra)
+    return record
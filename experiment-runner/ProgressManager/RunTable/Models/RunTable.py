@@ -0,0 +1,50 @@
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class RunTable(Sequence):
+    """The runs of an experiment in the order in which they are performed, indexed by their `__run_id` and, if
+    `cell_of` is given, by their cell (treatment combination). The order of the runs is fixed once created."""
+
+    def __init__(self, runs: Iterable[Dict], cell_of: Optional[Callable[[Dict], Tuple]] = None):
+        self.__runs: List[Dict] = list(runs)
+        self.__positions: Dict[str, int] = {run['__run_id']: position for position, run in enumerate(self.__runs)}
+        if len(self.__positions) != len(self.__runs):
+            raise BaseError("Duplicate run id detected in the run table!")
+
+        self.__cells: Optional[Dict[Tuple, List[Dict]]] = None
+        if cell_of is not None:
+            self.__cells = {}
+            for run in self.__runs:
+                self.__cells.setdefault(cell_of(run), []).append(run)
+
+    def __getitem__(self, position):
+        return self.__runs[position]
+
+    def __len__(self) -> int:
+        return len(self.__runs)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.__runs)
+
+    def __contains__(self, run) -> bool:
+        return self.get(run['__run_id']) is run
+
+    def index(self, run: Dict, *args) -> int:
+        """The position of the run in the run table, looked up by its id."""
+        position = self.__positions.get(run['__run_id'])
+        if position is None:
+            raise ValueError(f"Run {run['__run_id']} is not in the run table")
+        return position
+
+    def get(self, run_id: str) -> Optional[Dict]:
+        position = self.__positions.get(run_id)
+        return self.__runs[position] if position is not None else None
+
+    def runs_of_cell(self, cell: Tuple) -> List[Dict]:
+        """The runs (repetitions) of a cell, in the order of the run table."""
+        if self.__cells is None:
+            raise BaseError("The run table is not indexed by cell!")
+        return self.__cells.get(cell, [])
@@ -1,8 +1,6 @@
 import sys
 import traceback
 import dill as pickle
-import hashlib
-import ast
 from typing import List
 from importlib import util
 
@@ -12,9 +10,30 @@ from ConfigValidator.CLIRegister.CLIRegister import CLIRegister
 from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
 from ConfigValidator.CustomErrors.ConfigErrors import ConfigInvalidClassNameError
 from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ExperimentOrchestrator.Experiment.ExperimentSimulator import ExperimentSimulator
+from ExperimentOrchestrator.Experiment.RunTableShard import RunTableShard
+from ExperimentOrchestrator.Experiment.RunQueueClient import parse_address
+from ExperimentOrchestrator.Misc.ConfigFingerprint import calc_ast_md5sum, method_fingerprints, attribute_fingerprints
 
 def is_no_argument_given(args: List[str]): return (len(args) == 1)
 def is_config_file_given(args: List[str]): return (args[1][-3:] == '.py')
+def is_simulation_requested(args: List[str]): return ('--simulate' in args[2:])
+def is_full_simulation_requested(args: List[str]): return ('--all' in args[2:])
+def is_extension_requested(args: List[str]): return ('--extend' in args[2:])
+def get_shard(args: List[str]):
+    if '--shard' not in args[2:]:
+        return None
+    try:
+        return RunTableShard(args[args.index('--shard') + 1])
+    except IndexError:
+        raise BaseError("--shard requires a shard: i/N, or a comma separated list of run ids")
+def get_address(args: List[str], option: str):
+    if option not in args[2:]:
+        return None
+    try:
+        return parse_address(args[args.index(option) + 1])
+    except IndexError:
+        raise BaseError(f"{option} requires an address: [host:]port")
 def load_and_get_config_file_as_module(args: List[str]):
     module_name = args[1].split('/')[-1].replace('.py', '')
     spec = util.spec_from_file_location(module_name, args[1]) 
@@ -23,31 +42,6 @@ def load_and_get_config_file_as_module(args: List[str]):
     spec.loader.exec_module(config_file)
     return config_file
 
-def calc_ast_md5sum(src, name):
-    tree = compile(src, name, 'exec', flags=ast.PyCF_ONLY_AST, optimize=0)
-
-    for node in ast.walk(tree):
-        # Ignores empty lines and comment only lines
-        if hasattr(node, 'lineno'):
-            setattr(node, 'lineno', 0)
-        if hasattr(node, 'col_offset'):
-            setattr(node, 'col_offset', 0)
-        if hasattr(node, 'end_lineno'):
-            setattr(node, 'end_lineno', 0)
-        if hasattr(node, 'end_col_offset'):
-            setattr(node, 'end_col_offset', 0)
-
-        # Ignore docstring
-        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef, ast.ClassDef, ast.Module)) and ast.get_docstring(node) is not None:
-            docstring_node = node.body[0].value
-            if isinstance(docstring_node, ast.Str):
-                docstring_node.s = ''
-            elif isinstance(docstring_node, ast.Constant) and isinstance(docstring_node.value, str):
-                docstring_node.value = ''
-
-    return hashlib.md5(pickle.dumps(tree)).digest()
-
-
 if __name__ == "__main__":
     try: 
         if is_no_argument_given(sys.argv):
@@ -56,14 +50,26 @@ if __name__ == "__main__":
         elif is_config_file_given(sys.argv):                                # If the first arugments ends with .py -> a config file is entered
             config_file = load_and_get_config_file_as_module(sys.argv)
 
-            if hasattr(config_file, 'RunnerConfig'):
+            if hasattr(config_file, 'RunnerConfig') and is_simulation_requested(sys.argv):
+                config = config_file.RunnerConfig()
+                ConfigValidator.validate_config(config)
+                ExperimentSimulator(config, is_full_simulation_requested(sys.argv)).simulate()  # Walk through the experiment on a virtual clock
+            elif hasattr(config_file, 'RunnerConfig'):
                 config = config_file.RunnerConfig()                         # Instantiate config from injected file
                 metadata = Metadata(
-                    calc_ast_md5sum(pickle.source.getsource(config_file), sys.argv[1])  # hash of the whole file, not just RunnerConfig
+                    calc_ast_md5sum(pickle.source.getsource(config_file), sys.argv[1]),  # hash of the whole file, not just RunnerConfig
+                    method_fingerprints(config),                            # and per hook, to tell which hooks changed on restart
+                    attribute_fingerprints(config)
                 )
 
                 ConfigValidator.validate_config(config)                     # Validate config as a valid RunnerConfig
-                ExperimentController(config, metadata).do_experiment()      # Instantiate controller with config and start experiment
+                coordinator_address = get_address(sys.argv, '--coordinator')
+                if coordinator_address is not None:                         # Hand out the runs to the workers, instead of performing them
+                    ExperimentController(config, metadata,
+                                         extend=is_extension_requested(sys.argv)).do_coordination(coordinator_address)
+                else:
+                    ExperimentController(config, metadata, get_shard(sys.argv), get_address(sys.argv, '--worker'),
+                                         is_extension_requested(sys.argv)).do_experiment()  # Instantiate controller with config and start experiment
             else:
                 raise ConfigInvalidClassNameError
         else:                                                               # Else, a utility command is entered
@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+def create_run_table(experiment_path: Path) -> CSVOutputManager:
+    csv_data_manager = CSVOutputManager(experiment_path)
+    csv_data_manager.write_run_table([{'__run_id': f"run_{i}", '__done': RunProgress.TODO, 'avg': ' '} for i in range(4)])
+    return csv_data_manager
+
+
+def tear_journal(experiment_path: Path):
+    # As left behind by a process killed while appending a record
+    with open(experiment_path / 'run_table.journal', 'a') as journal:
+        journal.write('{"__run_id": "run_1", "colu')
+
+
+def test_torn_record_in_the_middle_of_the_journal(tmp_path):
+    csv_data_manager = create_run_table(tmp_path)
+    csv_data_manager.update_row_columns('run_0', {'__done': RunProgress.DONE, 'avg': 1})
+    tear_journal(tmp_path)
+    csv_data_manager.update_row_columns('run_2', {'__done': RunProgress.FAILED})
+    csv_data_manager.update_row_columns('run_3', {'__done': RunProgress.DONE, 'avg': 3})
+
+    for run_table in [csv_data_manager.read_run_table({'avg': int}),
+                      (csv_data_manager.compact_run_table(), csv_data_manager.read_run_table({'avg': int}))[1]]:
+        assert [variation['__done'] for variation in run_table] == \
+               [RunProgress.DONE, RunProgress.TODO, RunProgress.FAILED, RunProgress.DONE]
+        assert [variation['avg'] for variation in run_table] == [1, " ", " ", 3]
+
+
+def test_torn_record_at_the_end_of_the_journal(tmp_path):
+    csv_data_manager = create_run_table(tmp_path)
+    csv_data_manager.update_row_columns('run_0', {'__done': RunProgress.DONE, 'avg': 1})
+    tear_journal(tmp_path)
+
+    run_table = csv_data_manager.read_run_table({'avg': int})
+    assert [variation['__done'] for variation in run_table] == \
+           [RunProgress.DONE, RunProgress.TODO, RunProgress.TODO, RunProgress.TODO]
+
+
+def test_row_updates_are_read_incrementally(tmp_path):
+    csv_data_manager = create_run_table(tmp_path)
+    run_data_manager = CSVOutputManager(tmp_path)  # as used by the run, in another process
+    run_data_manager.update_row_data({'__run_id': 'run_1', '__done': RunProgress.DONE, 'avg': 2})
+    assert csv_data_manager.read_row_updates('run_1') == {'__run_id': 'run_1', '__done': 'DONE', 'avg': 2}
+
+    run_data_manager.update_row_columns('run_1', {'avg': 3})
+    tear_journal(tmp_path)
+    assert csv_data_manager.read_row_updates('run_1')['avg'] == 3
+    assert csv_data_manager.read_row_updates('run_2') == {}
+
+    csv_data_manager.compact_run_table()
+    assert csv_data_manager.read_row_updates('run_1')['avg'] == 3
+    assert csv_data_manager.read_run_table({'avg': int})[1]['avg'] == 3
+
+
+def test_row_updates_are_kept_when_compacted_during_the_experiment(tmp_path):
+    csv_data_manager = create_run_table(tmp_path)
+    run_data_manager = CSVOutputManager(tmp_path)
+    run_data_manager.update_row_data({'__run_id': 'run_0', '__done': RunProgress.DONE, 'avg': 1})
+    journal_size = (tmp_path / 'run_table.journal').stat().st_size
+
+    # Not compacted until the journal reached the given size
+    csv_data_manager.compact_run_table(min_journal_size=journal_size + 1)
+    assert (tmp_path / 'run_table.journal').stat().st_size == journal_size
+    run_data_manager.update_row_data({'__run_id': 'run_2', '__done': RunProgress.DONE, 'avg': 2})
+    csv_data_manager.compact_run_table(min_journal_size=journal_size + 1)
+    assert (tmp_path / 'run_table.journal').stat().st_size == 0
+
+    # The updates that were compacted before they were read are still read, the journal is read on from its start
+    assert csv_data_manager.read_row_updates('run_2')['avg'] == 2
+    run_data_manager.update_row_columns('run_0', {'avg': 4})
+    assert csv_data_manager.read_row_updates('run_0')['avg'] == 4
+    assert [variation['avg'] for variation in csv_data_manager.read_run_table({'avg': int})] == [4, " ", 2, " "]
+
+
+def test_close_leaves_the_compacted_run_table_without_lock_file(tmp_path):
+    csv_data_manager = create_run_table(tmp_path)
+    csv_data_manager.update_row_columns('run_0', {'__done': RunProgress.DONE, 'avg': 1})
+    csv_data_manager.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['run_table.csv', 'run_table.journal']
+    assert (tmp_path / 'run_table.journal').stat().st_size == 0
+    assert csv_data_manager.read_run_table({'avg': int})[0]['avg'] == 1
+
+
+def test_runs_are_renamed_in_the_phase_timings(tmp_path):
+    csv_data_manager = create_run_table(tmp_path)
+    csv_data_manager.append_phase_timings('run_0', [('START_RUN', 1.0, 2.0), ('STOP_RUN', 3.0, 4.0)])
+    csv_data_manager.append_phase_timings('run_1', [('START_RUN', 5.0, 6.0)])
+
+    csv_data_manager.rename_runs_in_phase_timings({'run_0': 'run_10'})
+    assert [(timing['__run_id'], timing['phase']) for timing in csv_data_manager.read_phase_timings()] == \
+           [('run_10', 'START_RUN'), ('run_10', 'STOP_RUN'), ('run_1', 'START_RUN')]
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+           ['phase_timings.csv', 'run_table.csv', 'run_table.csv.lock']
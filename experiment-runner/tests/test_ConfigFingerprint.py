@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ExperimentOrchestrator.Misc.ConfigFingerprint import (method_fingerprints, attribute_fingerprints,
+                                                           result_fingerprint, changed_fingerprints)
+
+
+class Profiler:
+    def __init__(self, interval):
+        self.interval = interval
+
+
+class Config:
+    name = "fingerprinted"
+    hosts = ['a', 'b']
+
+    def __init__(self, interval=10):
+        self.profiler = Profiler(interval)
+
+    def interact(self, context):
+        """Waits."""
+        return sleep(1)
+
+    def after_experiment(self):
+        pass
+
+
+class ChangedConfig(Config):
+    name = "renamed"
+    hosts = ['a']
+
+    def interact(self, context):
+        """Waits, but documented differently."""
+
+        # and commented
+        return sleep(1)
+
+    def after_experiment(self):
+        print("done")
+
+
+def sleep(seconds):
+    pass
+
+
+def test_fingerprints_ignore_formatting_and_addresses():
+    assert method_fingerprints(ChangedConfig())['interact'] == method_fingerprints(Config())['interact']
+    assert 'module.sleep' in method_fingerprints(Config())
+    assert attribute_fingerprints(Config()) == attribute_fingerprints(Config())  # the profiler object by its state
+    assert attribute_fingerprints(Config(20))['profiler'] != attribute_fingerprints(Config())['profiler']
+
+
+def test_result_fingerprint_leaves_out_what_does_not_influence_the_results():
+    # The name, hosts and after_experiment do not change the results of the runs
+    assert result_fingerprint(ChangedConfig()) == result_fingerprint(Config())
+    assert changed_fingerprints(attribute_fingerprints(Config()), attribute_fingerprints(ChangedConfig())) == \
+           ['hosts', 'name']
+    assert changed_fingerprints(result_fingerprint(Config()), result_fingerprint(Config(20))) == ['profiler']
+    assert changed_fingerprints({'interact': 'aaaa'}, {'start_run': 'bbbb'}) == ['interact', 'start_run']
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.Config.Models.CooldownPolicy import CooldownPolicy
+
+
+class Probe:
+    def __init__(self, samples):
+        self.samples = list(samples)
+        self.calls = 0
+
+    def __call__(self) -> float:
+        self.calls += 1
+        return self.samples[min(self.calls, len(self.samples)) - 1]
+
+
+def test_cooldown_ends_once_stable():
+    probe = Probe([90, 60, 40, 30, 30, 30])
+    cooldown_ms = CooldownPolicy(probe, tolerance=1.0, poll_interval_in_ms=1, window=3).wait(10000)
+    assert probe.calls == 6
+    assert cooldown_ms < 10000
+
+
+def test_cooldown_ends_at_its_maximum(capsys):
+    probe = Probe([90, 60])
+    cooldown_ms = CooldownPolicy(probe, tolerance=1.0, poll_interval_in_ms=10).wait(50)
+    assert cooldown_ms >= 50
+    assert "Maximum cooldown of 50ms reached" in capsys.readouterr().out
+
+
+def test_no_cooldown_without_budget(capsys):
+    # time_between_runs_in_ms = 0: the runs follow each other without probing or warning about the maximum cooldown
+    probe = Probe([90])
+    assert CooldownPolicy(probe, tolerance=1.0).wait(0) == 0
+    assert CooldownPolicy(probe, tolerance=1.0, max_cooldown_in_ms=0).wait(1000) == 0
+    assert probe.calls == 0
+    assert "Maximum cooldown" not in capsys.readouterr().out
@@ -0,0 +1,97 @@
+import sys
+import itertools
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.FractionalFactorialDesign import FractionalFactorialDesign
+from ConfigValidator.Config.Models.LatinHypercubeDesign import LatinHypercubeDesign
+from ConfigValidator.Config.Models.OrthogonalArrayDesign import OrthogonalArrayDesign
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+def create_factors(count: int, levels: int):
+    return [FactorModel(f"factor_{i}", list(range(levels))) for i in range(count)]
+
+
+def assert_balanced(cells, levels: int):
+    # Every treatment of every factor occurs equally often
+    for column in zip(*cells):
+        assert Counter(column) == {level: len(cells) // levels for level in range(levels)}
+
+
+def assert_orthogonal(cells, levels: int, strength: int = 2):
+    # Every combination of the treatments of any `strength` factors occurs equally often
+    for columns in itertools.combinations(range(len(cells[0])), strength):
+        counts = Counter(tuple(cell[column] for column in columns) for cell in cells)
+        assert len(counts) == levels ** strength
+        assert len(set(counts.values())) == 1
+
+
+@pytest.mark.parametrize('resolution, runs', [(3, 8), (4, 16), (5, 64)])
+def test_fractional_factorial_design(resolution, runs):
+    cells = FractionalFactorialDesign(resolution).generate_cells(create_factors(7, 2))
+    assert len(cells) == len(set(cells)) == runs
+    assert_balanced(cells, 2)
+    assert_orthogonal(cells, 2)
+    if resolution >= 4:
+        assert_orthogonal(cells, 2, strength=3)  # a 2-level design of resolution R is an orthogonal array of strength R - 1
+    if resolution >= 5:
+        assert_orthogonal(cells, 2, strength=4)
+
+
+def test_fractional_factorial_design_is_full_factorial_for_few_factors():
+    assert sorted(FractionalFactorialDesign(5).generate_cells(create_factors(3, 2))) == \
+           list(itertools.product([0, 1], repeat=3))
+
+
+def test_invalid_fractional_factorial_design_raises():
+    with pytest.raises(BaseError):
+        FractionalFactorialDesign(2)
+    with pytest.raises(BaseError):
+        FractionalFactorialDesign(3).generate_cells(create_factors(3, 3))
+
+
+@pytest.mark.parametrize('factors, levels, strength, runs', [(4, 3, 2, 9),      # L9
+                                                             (6, 5, 2, 25),
+                                                             (4, 3, 3, 27),
+                                                             (3, 2, 2, 4)])
+def test_orthogonal_array_design(factors, levels, strength, runs):
+    cells = OrthogonalArrayDesign(strength).generate_cells(create_factors(factors, levels))
+    assert len(cells) == len(set(cells)) == runs
+    assert_balanced(cells, levels)
+    assert_orthogonal(cells, levels, strength)
+
+
+def test_invalid_orthogonal_array_design_raises():
+    with pytest.raises(BaseError):
+        OrthogonalArrayDesign(1)
+    with pytest.raises(BaseError):
+        OrthogonalArrayDesign(2).generate_cells(create_factors(3, 4))           # not a prime number of treatments
+    with pytest.raises(BaseError):
+        OrthogonalArrayDesign(2).generate_cells(create_factors(5, 3))           # more than 3 + 1 factors
+    with pytest.raises(BaseError):
+        OrthogonalArrayDesign(2).generate_cells(create_factors(2, 3) + create_factors(1, 5))
+
+
+def test_latin_hypercube_design():
+    # As many samples as treatments: every treatment of every factor is sampled exactly once
+    cells = LatinHypercubeDesign(7, seed=3).generate_cells(create_factors(4, 7))
+    assert len(cells) == 7
+    assert_balanced(cells, 7)
+
+    # Every factor is covered evenly, and the sample is reproducible
+    cells = LatinHypercubeDesign(20, seed=3).generate_cells(create_factors(4, 5))
+    assert len(cells) <= 20
+    assert cells == LatinHypercubeDesign(20, seed=3).generate_cells(create_factors(4, 5))
+    for column in zip(*cells):
+        assert set(column) == set(range(5))
+
+
+def test_invalid_latin_hypercube_design_raises():
+    with pytest.raises(BaseError):
+        LatinHypercubeDesign(0)
@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.RepetitionModel import RepetitionModel
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class ExtendedConfig(RunnerConfig):
+    name = "extended"
+    cpu_treatments = ['low', 'high']
+
+    def create_run_table_model(self) -> RunTableModel:
+        self.run_table_model = RunTableModel(factors=[FactorModel('cpu', self.cpu_treatments)], data_columns=['avg'],
+                                             repetitions=RepetitionModel(2, 2))
+        return self.run_table_model
+
+
+def create_controller(tmp_path, cpu_treatments, extend=False):
+    config = ExtendedConfig()
+    config.cpu_treatments = cpu_treatments
+    config.results_output_path = tmp_path
+    ConfigValidator.validate_config(config)
+    # Only the factors changed, in create_run_table_model, which does not influence the results of the stored runs
+    metadata = Metadata(f"md5sum {cpu_treatments}".encode(), {'create_run_table_model': str(cpu_treatments)}, {})
+    return ExperimentController(config, metadata, extend=extend)
+
+
+def key_of(variation):
+    return variation['cpu'], variation['__repetition']
+
+
+@pytest.fixture
+def performed_experiment(tmp_path):
+    # As performed before the treatments were added: every run done, with its run folder and phase timings
+    controller = create_controller(tmp_path, ['low', 'high'])
+    csv_data_manager = CSVOutputManager(controller.config.experiment_path)
+    results = {}
+    for i, variation in enumerate(controller.run_table):
+        results[key_of(variation)] = i
+        csv_data_manager.update_row_columns(variation['__run_id'], {'__done': RunProgress.DONE, 'avg': i})
+        csv_data_manager.append_phase_timings(variation['__run_id'], [('START_RUN', 0.0, float(i))])
+        (controller.config.experiment_path / variation['__run_id']).mkdir()
+        (controller.config.experiment_path / variation['__run_id'] / 'result.txt').write_text(str(i))
+    return controller.config.experiment_path, results
+
+
+def test_added_treatments_require_extend(tmp_path, performed_experiment):
+    with pytest.raises(BaseError):
+        create_controller(tmp_path, ['low', 'mid', 'high'])
+
+
+def test_extend_keeps_the_results_of_the_stored_runs(tmp_path, performed_experiment):
+    experiment_path, results = performed_experiment
+    controller = create_controller(tmp_path, ['low', 'mid', 'high'], extend=True)
+    assert len(controller.run_table) == 6
+
+    # The stored runs are matched by their treatments and repetition, the runs of the new treatment are to be performed
+    csv_data_manager = CSVOutputManager(experiment_path)
+    run_table = csv_data_manager.read_run_table({'avg': int})
+    timings = {timing['__run_id']: timing['duration_ms'] for timing in csv_data_manager.read_phase_timings()}
+    for variation in run_table:
+        generated_var = controller.run_table.get(variation['__run_id'])
+        assert key_of(generated_var) == key_of(variation)
+        if variation['cpu'] == 'mid':
+            assert variation['__done'] == RunProgress.TODO
+            assert not (experiment_path / variation['__run_id']).exists()
+            continue
+        result = results[key_of(variation)]
+        assert variation['__done'] == generated_var['__done'] == RunProgress.DONE
+        assert variation['avg'] == generated_var['avg'] == result
+        assert timings[variation['__run_id']] == result
+        assert (experiment_path / variation['__run_id'] / 'result.txt').read_text() == str(result)
+
+    # The runs of the high treatment, after the new one, got a new id. The stored run table is kept as a backup
+    assert {variation['__run_id']: key_of(variation) for variation in run_table} == \
+           {'run_0': ('low', 1), 'run_1': ('low', 2), 'run_2': ('mid', 1), 'run_3': ('mid', 2),
+            'run_4': ('high', 1), 'run_5': ('high', 2)}
+    assert len(list(experiment_path.glob('run_table.csv.*.bak'))) == 1
+    assert not list(experiment_path.glob('*.extending'))
+
+
+def test_extend_cannot_remove_treatments(tmp_path, performed_experiment):
+    with pytest.raises(BaseError):
+        create_controller(tmp_path, ['low'], extend=True)
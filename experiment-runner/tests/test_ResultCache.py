@@ -0,0 +1,39 @@
+import sys
+import json
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ProgressManager.Output.ResultCache import ResultCache
+
+fingerprint = {'interact': 'aaaa', 'time_between_runs_in_ms': 'bbbb'}
+run = {'__run_id': 'run_3', 'cpu': 'low', 'threads': 4, '__repetition': 2}
+
+
+def test_results_are_cached_by_what_determines_them(tmp_path):
+    cache = ResultCache(tmp_path / 'cache', fingerprint, ['cpu', 'threads'])
+    assert cache.lookup(run, 'host-a') is None
+
+    cache.store(run, 'host-a', {'avg': 1.5}, source='experiments/a/run_3')
+    result = cache.lookup({**run, '__run_id': 'run_7', 'avg': " "}, 'host-a')  # the id and run data do not matter
+    assert result['run_data'] == {'avg': 1.5} and result['source'] == 'experiments/a/run_3'
+
+    assert cache.lookup({**run, 'threads': 8}, 'host-a') is None
+    assert cache.lookup({**run, '__repetition': 1}, 'host-a') is None
+    assert cache.lookup(run, 'host-b') is None
+    assert ResultCache(tmp_path / 'cache', {**fingerprint, 'interact': 'cccc'}, ['cpu', 'threads']).lookup(run, 'host-a') is None
+    assert [path.suffix for path in (tmp_path / 'cache').iterdir()] == ['.json']
+
+
+def test_stale_and_unreadable_results_are_ignored(tmp_path):
+    cache = ResultCache(tmp_path, fingerprint, ['cpu', 'threads'], max_age_in_ms=60 * 1000)
+    cache.store(run, 'host-a', {'avg': 1.5}, source='experiments/a/run_3')
+    result_file = tmp_path / f"{cache.key_of(run, 'host-a')}.json"
+
+    result = json.loads(result_file.read_text())
+    result['cached_at'] -= 61
+    result_file.write_text(json.dumps(result))
+    assert cache.lookup(run, 'host-a') is None
+
+    result_file.write_text('{"cached_at": ')
+    assert cache.lookup(run, 'host-a') is None
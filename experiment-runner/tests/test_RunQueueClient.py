@@ -0,0 +1,108 @@
+import sys
+import time
+import queue
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.RepetitionModel import RepetitionModel
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ExperimentOrchestrator.Experiment.RunQueueClient import RunQueueClient
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class CoordinatedConfig(RunnerConfig):
+    name = "coordinated"
+    run_retries = 1
+
+    def create_run_table_model(self) -> RunTableModel:
+        self.run_table_model = RunTableModel(factors=[FactorModel('load', ['low'])], data_columns=['avg'],
+                                             repetitions=RepetitionModel(4, 4))
+        return self.run_table_model
+
+
+def as_worker(name: str, request):
+    # The coordinator tells the workers apart by their host, process and thread
+    result = {}
+    def perform():
+        try:
+            result['reply'] = request()
+        except Exception as e:
+            result['error'] = e
+    worker = threading.Thread(target=perform, name=name)
+    worker.start()
+    worker.join()
+    if 'error' in result:
+        raise result['error']
+    return result['reply']
+
+
+@pytest.fixture
+def coordinator(tmp_path, monkeypatch):
+    monkeypatch.setattr(RunQueueClient, 'WAIT_INTERVAL_IN_S', 0.05)
+    monkeypatch.setattr(RunQueueClient, 'CONNECT_INTERVAL_IN_S', 0.05)
+
+    config = CoordinatedConfig()
+    config.results_output_path = tmp_path
+    ConfigValidator.validate_config(config)
+    controller = ExperimentController(config, Metadata(b'the config md5sum', {}, {}))
+
+    with socket.socket() as free_port:
+        free_port.bind(('localhost', 0))
+        address = free_port.getsockname()
+    coordination = threading.Thread(target=controller.do_coordination, args=[address], daemon=True)
+    coordination.start()
+    time.sleep(0.5)  # until it listens
+    yield controller, address, coordination
+
+
+def test_worker_with_another_config_is_refused(coordinator):
+    controller, address, _ = coordinator
+    with pytest.raises(BaseError):
+        RunQueueClient(address, b'another md5sum', controller.run_table).get_nowait()
+
+
+def test_runs_are_handed_out_and_their_results_stored(coordinator):
+    controller, address, coordination = coordinator
+    worker_a = RunQueueClient(address, b'the config md5sum', controller.run_table)
+    worker_b = RunQueueClient(address, b'the config md5sum', controller.run_table)
+
+    # Worker b takes a run and disconnects, worker a performs all other runs
+    [lost_run] = as_worker('worker-b', worker_b.get_nowait)
+    time.sleep(0.2)
+    performed_runs = []
+    while True:
+        try:
+            [variation] = as_worker('worker-a', worker_a.get_nowait)
+        except queue.Empty:
+            break
+        performed_runs.append(variation['__run_id'])
+        as_worker('worker-a', lambda: worker_a.report(variation, {'avg': len(performed_runs)}, None))
+        if variation is lost_run:
+            # The result of worker b, reported after all, does not overwrite the one of worker a
+            as_worker('worker-b', lambda: worker_b.report(lost_run, {'avg': 99}, None))
+
+    # Its result overdue, the run of worker b is handed out again (a retry), and performed by worker a
+    assert sorted(performed_runs) == [f"run_{i}" for i in range(4)]
+    assert performed_runs[-1] == lost_run['__run_id']
+    coordination.join(timeout=10)
+    assert not coordination.is_alive()
+
+    run_table = {variation['__run_id']: variation
+                 for variation in CSVOutputManager(controller.config.experiment_path).read_run_table({'avg': int})}
+    for i, run_id in enumerate(performed_runs):
+        assert run_table[run_id]['__done'] == RunProgress.DONE
+        assert run_table[run_id]['avg'] == i + 1
+        assert run_table[run_id]['__attempts'] == (2 if run_id == lost_run['__run_id'] else 1)
+        assert run_table[run_id]['__failure'] == " "
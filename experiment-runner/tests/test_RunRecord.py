@@ -0,0 +1,58 @@
+import sys
+import pickle
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ProgressManager.RunTable.Models.RunRecord import RunRecord
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+positions = RunRecord.positions_of(['__run_id', '__done', 'cpu', 'avg'])
+
+
+def create_run(run_id: str = 'run_0') -> RunRecord:
+    return RunRecord(positions, [run_id, RunProgress.TODO, 'low', " "])
+
+
+def test_run_record_behaves_as_a_dict():
+    run = create_run()
+    assert dict(run) == {'__run_id': 'run_0', '__done': RunProgress.TODO, 'cpu': 'low', 'avg': " "}
+    assert run == dict(run) and len(run) == 4 and 'cpu' in run and 'memory' not in run
+    assert run.get('memory') is None
+    with pytest.raises(KeyError):
+        run['memory']
+
+    run['avg'] = 1.5
+    run.update({'__done': RunProgress.DONE, 'memory': 12})  # a column that is not part of the run table is kept aside
+    assert list(run) == ['__run_id', '__done', 'cpu', 'avg', 'memory']
+    assert run['avg'] == 1.5 and run['__done'] == RunProgress.DONE and run['memory'] == 12
+
+    del run['memory']
+    assert 'memory' not in run
+    with pytest.raises(KeyError):
+        del run['cpu']
+
+
+def test_run_records_share_their_positions():
+    run, other_run = create_run('run_0'), create_run('run_1')
+    other_run['__run_id'] = 'run_0'
+    assert run == other_run
+    other_run['memory'] = 12
+    assert run != other_run
+
+    copied_run = other_run.copy()
+    copied_run['avg'], copied_run['memory'] = 2.5, 13
+    assert other_run['avg'] == " " and other_run['memory'] == 12
+
+
+def test_pickled_run_records_share_their_positions():
+    runs = [create_run(f"run_{i}") for i in range(3)]
+    runs[1]['memory'] = 12
+    unpickled_runs = pickle.loads(pickle.dumps(runs))
+    assert unpickled_runs == runs
+    assert [dict(run) for run in unpickled_runs] == [dict(run) for run in runs]
+
+    unpickled_runs[0]['cpu'] = 'high'
+    assert unpickled_runs[1]['cpu'] == 'low'  # the values are not shared, only the positions
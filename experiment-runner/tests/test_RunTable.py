@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunTable import RunTable
+
+
+def create_runs():
+    return [{'__run_id': f"run_{i}", 'cpu': cpu, '__repetition': repetition}
+            for i, (cpu, repetition) in enumerate([('low', 1), ('high', 1), ('low', 2), ('high', 2)])]
+
+
+def cell_of(run):
+    return (run['cpu'],)
+
+
+def test_runs_are_indexed_by_id():
+    runs = list(reversed(create_runs()))
+    run_table = RunTable(runs, cell_of)
+    assert list(run_table) == runs and len(run_table) == 4 and run_table[0] is runs[0]
+    assert run_table.get('run_1') is runs[2] and run_table.get('run_9') is None
+    assert run_table.index(runs[2]) == 2
+    assert runs[2] in run_table and dict(runs[2]) not in run_table  # by identity, as the list of runs
+    with pytest.raises(ValueError):
+        run_table.index({'__run_id': 'run_9'})
+
+
+def test_runs_are_indexed_by_cell():
+    runs = create_runs()
+    run_table = RunTable(runs, cell_of)
+    assert run_table.runs_of_cell(('low',)) == [runs[0], runs[2]]
+    assert run_table.runs_of_cell(('mid',)) == []
+    with pytest.raises(BaseError):
+        RunTable(runs).runs_of_cell(('low',))
+
+
+def test_duplicate_run_ids_raise():
+    runs = create_runs()
+    runs[1]['__run_id'] = 'run_0'
+    with pytest.raises(BaseError):
+        RunTable(runs)
@@ -0,0 +1,86 @@
+import sys
+import itertools
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RepetitionModel import RepetitionModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.LatinHypercubeDesign import LatinHypercubeDesign
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+cpu = FactorModel('cpu', ['low', 'mid', 'high'])
+threads = FactorModel('threads', [1, 2, 4, 8])
+cache = FactorModel('cache', [True, False])
+factors = [cpu, threads, cache]
+
+treatment_exclusions = [{cpu: ['low'], threads: [4, 8]},     # 4 combinations
+                        {cache: [False], threads: [1]}]      # 3 combinations
+predicate_exclusions = [lambda run: run['cpu'] == 'high' and run['cache']]
+
+
+def create_run_table_models():
+    return [RunTableModel(factors, data_columns=['avg']),
+            RunTableModel(factors, exclude_variations=treatment_exclusions, data_columns=['avg']),
+            RunTableModel(factors, exclude_variations=treatment_exclusions + predicate_exclusions,
+                          repetitions=RepetitionModel(2, 3)),
+            RunTableModel(factors, exclude_variations=predicate_exclusions, design=LatinHypercubeDesign(6))]
+
+
+def combos_of(runs):
+    return [tuple(run[factor.factor_name] for factor in factors) for run in runs]
+
+
+@pytest.mark.parametrize('run_table_model', create_run_table_models())
+def test_run_ids_index_the_runs(run_table_model):
+    runs = list(run_table_model.iter_runs())
+    runs_by_id = {run['__run_id']: run for run in runs}
+    assert len(runs_by_id) == len(runs)
+
+    for index in range(run_table_model.get_design_size()):
+        run = run_table_model.get_run(f"run_{index}")
+        if f"run_{index}" in runs_by_id:
+            assert dict(run) == dict(runs_by_id[f"run_{index}"])
+        else:
+            assert run is None  # excluded, or not part of the design
+
+
+def test_runs_equal_the_filtered_full_factorial():
+    # As generated before the runs were generated lazily: the full factorial without the excluded combinations, in order
+    def is_excluded(combo):
+        return any(all(combo[factors.index(factor)] in treatments for factor, treatments in exclusion.items())
+                   for exclusion in treatment_exclusions)
+    expected_combos = [combo for combo in itertools.product(*[factor.treatments for factor in factors])
+                       if not is_excluded(combo)]
+
+    runs = list(RunTableModel(factors, exclude_variations=treatment_exclusions, data_columns=['avg']).iter_runs())
+    assert combos_of(runs) == expected_combos
+    assert len(runs) == 3 * 4 * 2 - 4 - 3
+    assert all(run['__done'] == RunProgress.TODO and run['avg'] == " " for run in runs)
+
+
+def test_excluded_combinations_never_appear():
+    run_table_model = RunTableModel(factors, exclude_variations=treatment_exclusions + predicate_exclusions,
+                                    repetitions=RepetitionModel(2, 3))
+    runs = run_table_model.generate_experiment_run_table()
+    for combo in combos_of(runs):
+        assert not (combo[0] == 'low' and combo[1] in [4, 8])
+        assert not (combo[2] is False and combo[1] == 1)
+        assert not (combo[0] == 'high' and combo[2] is True)
+    assert len(runs) == 3 * (3 * 4 * 2 - 4 - 3 - 4)  # the predicate excludes 4 more combinations
+    assert sorted(combos_of(runs)) == sorted(combos_of(run_table_model.iter_runs()))
+
+
+@pytest.mark.parametrize('run_id', ['run_-1', 'run_24', 'run_1000'])
+def test_run_ids_outside_the_design_raise(run_id):
+    with pytest.raises(BaseError):
+        RunTableModel(factors).get_run(run_id)
+
+
+def test_invalid_run_ids_raise():
+    with pytest.raises(BaseError):
+        RunTableModel(factors).get_run('run_x')
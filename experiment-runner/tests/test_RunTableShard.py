@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.RepetitionModel import RepetitionModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.RunTableShard import RunTableShard
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+def create_run_table_model():
+    return RunTableModel(factors=[FactorModel('cpu', ['low', 'mid', 'high']), FactorModel('threads', [1, 2])],
+                         data_columns=['avg'], repetitions=RepetitionModel(2, 2))
+
+
+def perform_shard(shard_path: Path, run_table, md5sum: bytes = b'the config md5sum'):
+    # As a controller machine would: the run table, a run folder per run, its phase timings and the metadata
+    shard_path.mkdir()
+    csv_data_manager = CSVOutputManager(shard_path)
+    csv_data_manager.write_run_table(run_table)
+    JSONOutputManager(shard_path).write_metadata(Metadata(md5sum))
+    for variation in run_table:
+        (shard_path / variation['__run_id']).mkdir()
+        (shard_path / variation['__run_id'] / 'measurement.txt').write_text(variation['__run_id'])
+        csv_data_manager.update_row_columns(variation['__run_id'], {'__done': RunProgress.DONE, 'avg': 1.5})
+        csv_data_manager.append_phase_timings(variation['__run_id'], [('START_RUN', 0.0, 10.0)])
+    return shard_path
+
+
+@pytest.mark.parametrize('count', [1, 2, 4, 6])
+def test_shards_split_the_run_table_by_cell(count):
+    run_table_model = create_run_table_model()
+    run_table = run_table_model.generate_experiment_run_table()
+    shards = [RunTableShard(f"{index}/{count}").select(run_table, run_table_model) for index in range(1, count + 1)]
+
+    # Every run is part of exactly one shard, all repetitions of a cell of the same one
+    assert sorted(variation['__run_id'] for shard in shards for variation in shard) == \
+           sorted(variation['__run_id'] for variation in run_table)
+    shard_cells = [set(run_table_model.get_cell(variation) for variation in shard) for shard in shards]
+    assert sum(len(cells) for cells in shard_cells) == 6
+    assert all(len(cells) in [6 // count, 6 // count + 1] for cells in shard_cells)
+
+
+def test_shard_of_run_ids():
+    run_table_model = create_run_table_model()
+    run_table = run_table_model.generate_experiment_run_table()
+    shard = RunTableShard("run_3, run_1")
+    assert [variation['__run_id'] for variation in shard.select(run_table, run_table_model)] == ['run_1', 'run_3']
+    assert shard.experiment_path(Path('experiments/gl')).name.startswith('gl_shard_')
+    with pytest.raises(BaseError):
+        RunTableShard("run_1,run_99").select(run_table, run_table_model)
+
+
+@pytest.mark.parametrize('spec', ['0/2', '3/2', '1/', 'run_x', ''])
+def test_invalid_shards_raise(spec):
+    with pytest.raises(BaseError):
+        RunTableShard(spec)
+
+
+def test_too_many_shards_raise():
+    run_table_model = create_run_table_model()
+    with pytest.raises(BaseError):
+        RunTableShard("7/7").select(run_table_model.generate_experiment_run_table(), run_table_model)
+
+
+def test_merge(tmp_path):
+    run_table_model = create_run_table_model()
+    run_table = run_table_model.generate_experiment_run_table()
+    shard_paths = [perform_shard(tmp_path / f"gl_shard_{index}of2",
+                                 RunTableShard(f"{index}/2").select(run_table, run_table_model))
+                   for index in [1, 2]]
+
+    RunTableShard.merge(tmp_path / 'gl', shard_paths)
+    merged_run_table = CSVOutputManager(tmp_path / 'gl').read_run_table()
+    assert [variation['__run_id'] for variation in merged_run_table] == \
+           sorted((variation['__run_id'] for variation in run_table), key=lambda run_id: int(run_id.split('_')[-1]))
+    assert all(variation['__done'] == RunProgress.DONE and variation['avg'] == 1.5 for variation in merged_run_table)
+    assert JSONOutputManager(tmp_path / 'gl').read_metadata().md5sum == b'the config md5sum'
+    assert sorted(timing['__run_id'] for timing in CSVOutputManager(tmp_path / 'gl').read_phase_timings()) == \
+           sorted(variation['__run_id'] for variation in run_table)
+    for variation in run_table:
+        assert (tmp_path / 'gl' / variation['__run_id'] / 'measurement.txt').read_text() == variation['__run_id']
+
+    # The merged folder holds a compacted run table, without the lock files and journals of the shards
+    assert not list((tmp_path / 'gl').rglob('*.lock')) and not list((tmp_path / 'gl').rglob('*.journal'))
+
+
+def test_merge_of_incompatible_shards_raises(tmp_path):
+    run_table_model = create_run_table_model()
+    run_table = run_table_model.generate_experiment_run_table()
+    first, second = run_table[:6], run_table[6:]
+    perform_shard(tmp_path / 'first', first)
+    perform_shard(tmp_path / 'second', second)
+    perform_shard(tmp_path / 'other_config', second, md5sum=b'another md5sum')
+    perform_shard(tmp_path / 'overlapping', run_table[4:])
+
+    with pytest.raises(BaseError):
+        RunTableShard.merge(tmp_path / 'gl', [tmp_path / 'first', tmp_path / 'other_config'])
+    with pytest.raises(BaseError):
+        RunTableShard.merge(tmp_path / 'gl', [tmp_path / 'first', tmp_path / 'overlapping'])
+    with pytest.raises(BaseError):
+        RunTableShard.merge(tmp_path / 'gl', [tmp_path / 'first', tmp_path / 'missing'])
+    assert not (tmp_path / 'gl').exists()